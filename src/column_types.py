@@ -0,0 +1,57 @@
+from configuration import ColumnSpec
+
+# workspace types for Keboola base types, used when a table has no native type definition
+BASETYPE_TYPES = {
+    "STRING": "VARCHAR",
+    "INTEGER": "NUMBER",
+    "NUMERIC": "NUMBER",
+    "FLOAT": "FLOAT",
+    "BOOLEAN": "BOOLEAN",
+    "DATE": "DATE",
+    "TIMESTAMP": "TIMESTAMP_NTZ",
+}
+DEFAULT_TYPE = "VARCHAR"
+
+
+def _metadata_values(metadata: list[dict]) -> dict[str, str]:
+    # later entries are newer, so they override values of the same key set by other providers
+    return {entry["key"]: entry["value"] for entry in metadata}
+
+
+def _is_true(value) -> bool:
+    return str(value).lower() in ("1", "true")
+
+
+def derive_columns(table_detail: dict) -> list[ColumnSpec]:
+    """
+    Column specs of a storage table with types taken from its metadata: the native definition of typed tables,
+    otherwise the KBC.datatype column metadata. Columns without any type information are nullable VARCHARs.
+    """
+    definition = (table_detail.get("definition") or {}).get("columns")
+    if definition:
+        return [
+            ColumnSpec(
+                name=column["name"],
+                dbName=column["name"],
+                type=column["definition"]["type"],
+                nullable=column["definition"].get("nullable", True),
+                size=str(column["definition"].get("length") or ""),
+            )
+            for column in definition
+        ]
+
+    columns_metadata = table_detail.get("columnMetadata") or {}
+    specs = []
+    for name in table_detail.get("columns", []):
+        values = _metadata_values(columns_metadata.get(name, []))
+        column_type = BASETYPE_TYPES.get(values.get("KBC.datatype.basetype", "").upper(), DEFAULT_TYPE)
+        specs.append(
+            ColumnSpec(
+                name=name,
+                dbName=name,
+                type=column_type,
+                nullable=_is_true(values.get("KBC.datatype.nullable", True)),
+                size=values.get("KBC.datatype.length", "") if column_type in ("VARCHAR", "NUMBER") else "",
+            )
+        )
+    return specs
@@ -1,18 +1,39 @@
+import hashlib
 import json
 import logging
+import os
 import time
+from dataclasses import asdict
 from datetime import datetime, timezone
-from pathlib import Path
+from typing import Callable
 
-from kbcstorage.client import Client
 from keboola.component.base import ComponentBase, sync_action
 from keboola.component.exceptions import UserException
 from keboola.component.sync_actions import MessageType, ValidationResult
-from keboola.utils import get_past_date
 from requests import HTTPError
 
-from configuration import Configuration
-from load_tables_dataclass import Column, StorageInput
+from column_types import derive_columns
+from configuration import ColumnSpec, Configuration, TableSpec, WorkspaceConfiguration
+from job_journal import JobJournal
+from job_metrics import expected_duration, record_job, render_openmetrics
+from job_scheduler import LoadJobResult, LoadJobScheduler, split_batches
+from job_waiter import JobWaiter
+from load_planner import LoadPlan, plan_delta_load, plan_load
+from load_tables_dataclass import StorageInput, Table
+from run_report import RunReport
+from storage_transport import StorageTransport
+from workspace_query import WorkspaceQuery, WorkspaceQueryError, list_tables_statement
+
+COMPONENT_ID = "keboola.app-data-gateway"
+PREVIEW_SUFFIX = "_preview"
+RUN_REPORT_FILE = "run_report.json"
+RUN_REPORT_TAGS = ["data-gateway", "run-report"]
+METRICS_FILE = "job_metrics.prom"
+# submitted jobs still unfinished after this long are given up, so their tables are loaded again
+SUBMITTED_JOB_MAX_AGE = 24 * 3600
+# state describing what the workspace holds; last_run is the watermark of tables without their own one
+LOAD_STATE = ("tables", "workspace_tables", "last_run", "pending_jobs", "submitted_jobs")
+METRICS_TAGS = ["data-gateway", "metrics"]
 
 
 def parse_last_run_to_timestamp(last_run) -> int:
@@ -26,79 +47,601 @@ def parse_last_run_to_timestamp(last_run) -> int:
         raise ValueError(f"Invalid last_run format: {type(last_run)}")
 
 
+def to_iso(timestamp: int) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).astimezone().isoformat()
+
+
+def fingerprint(data: dict) -> str:
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()[:16]
+
+
 class Component(ComponentBase):
     def __init__(self):
         super().__init__()
-        self.params = Configuration(**self.configuration.parameters)
+        self.report = RunReport()
+        self._params = None
+        self._workspace_params = None
+        self._client = None
+        self._transport = None
         self.storage_input = None
         self.start_timestamp = None
+        self.window_until = None
+        self.deadline = None
+        self.job_created: dict[str, int] = {}
+        self._tables_detail = None
+        self._tables_detail_include: set[str] = set()
+        self.workspace_id_cached = False
+        self.fingerprints: dict[str, str] = {}
+        self.delta_tables: set[str] = set()
         self.state = self.get_state_file()
-        self.client = Client(
-            self.environment_variables.url,
-            self.environment_variables.token,
-            self.environment_variables.branch_id,
-            file_storage_support=False,
-        )
+
+    @property
+    def configuration(self):
+        """
+        Parsed config.json. The base class reads and parses the file on every access, which is slow for
+        configurations with many columns, so the first result is kept.
+        """
+        if "_configuration" not in vars(self):
+            self._configuration = super().configuration
+        return self._configuration
+
+    @property
+    def params(self) -> Configuration:
+        """
+        All parameters, validated on first use so that sync actions do not pay for parsing the column mappings.
+        """
+        if self._params is None:
+            with self.report.phase("config_validation"):
+                self._params = Configuration(**self.configuration.parameters)
+        return self._params
+
+    @property
+    def workspace_params(self) -> WorkspaceConfiguration:
+        if self._params is not None:
+            return self._params
+        if self._workspace_params is None:
+            self._workspace_params = WorkspaceConfiguration(**self.configuration.parameters)
+        return self._workspace_params
+
+    @property
+    def preserve_workspace(self) -> bool:
+        """
+        Whether loads keep the other workspace tables. Previews always do, as they load next to the real tables.
+        """
+        return self.params.preserve_existing_tables or bool(self.params.preview_rows)
+
+    @property
+    def transport(self) -> StorageTransport:
+        if self._transport is None:
+            parallel_jobs = self._params.parallel_jobs if self._params is not None else 1
+            self._transport = StorageTransport(pool_size=max(10, 2 * parallel_jobs))
+        return self._transport
+
+    @property
+    def client(self):
+        """
+        Storage API client, built on first use. kbcstorage imports the SDKs of all file storage backends,
+        so the import is deferred until an action talks to Storage API.
+        """
+        if self._client is None:
+            from kbcstorage.client import Client
+
+            self._client = Client(
+                self.environment_variables.url,
+                self.environment_variables.token,
+                self.environment_variables.branch_id,
+                file_storage_support=False,
+            )
+            self.transport.attach(self._client)
+        return self._client
 
     def run(self):
-        self.storage_input = StorageInput(**self.configuration.config_data.get("storage", {}).get("input"))
+        try:
+            self.load()
+        except Exception as e:
+            self.report.fail(e)
+            raise
+        finally:
+            self.write_run_report()
+
+    def load(self):
+        with self.report.phase("storage_input_parsing"):
+            self.storage_input = self.load_storage_input()
         if not self.storage_input.tables:
             raise UserException("No tables found. Please add one to the input mapping.")
 
         self.start_timestamp = int(time.time())
+        if self.params.run_timeout_seconds:
+            self.deadline = time.monotonic() + self.params.run_timeout_seconds
 
-        table_mapping = self.build_table_mapping()
+        if self.state.get("submitted_jobs"):
+            with self.report.phase("submitted_jobs_check"):
+                self.finalize_submitted_jobs(self.state)
 
-        try:
-            job = self.client.workspaces.load_tables(
-                workspace_id=self.get_workspace_id(),
-                table_mapping=table_mapping,
-                preserve=self.params.preserve_existing_tables,
-            )
+        with self.report.phase("build_table_mapping"):
+            table_mapping = self.build_table_mapping()
 
-            logging.debug(table_mapping)
-            logging.debug(job)
-
-            while True:
-                job = self.client.jobs.detail(job["id"])
-                if job["status"] in ["success", "error"]:
-                    break
-                logging.debug(f"Job {job['id']} is still running, status: {job['status']}")
-                time.sleep(5)
-
-            match job["status"]:
-                case "error":
-                    logging.debug(f"Table mapping: {table_mapping}")
-                    raise UserException(f"Job {job['id']} failed with error: {job.get('error', {}).get('message')}")
-                case "success":
-                    created = datetime.fromisoformat(job["createdTime"])
-                    start = datetime.fromisoformat(job["startTime"])
-                    end = datetime.fromisoformat(job["endTime"])
-                    logging.info(
-                        f"Load of {self.params.destination_table_name} finished successfully. Storage job {job['id']} "
-                        f"queued for {(start - created).seconds} s and processed for {(end - start).seconds} s."
+        if self.params.preview_rows:
+            # previews go to separate tables, so the state of the real tables is left untouched
+            logging.info(f"Preview mode, loading up to {self.params.preview_rows} rows of each table.")
+            self.load_table_mapping(table_mapping)
+            self.remember_workspace_tables(table_mapping)
+            self.state.pop("pending_jobs", None)
+            self.write_state_file(self.state)
+            return
+
+        to_load = self.skip_unchanged_tables(table_mapping)
+        in_flight = {table["destination"] for job in self.state.get("submitted_jobs", []) for table in job["tables"]}
+        in_flight &= {table["destination"] for table in to_load}
+        if in_flight:
+            logging.info(f"Tables {', '.join(sorted(in_flight))} are still being loaded by a previous run, skipping.")
+            to_load = [table for table in to_load if table["destination"] not in in_flight]
+
+        if to_load and not self.params.wait_for_jobs:
+            if self.params.incremental_slice_seconds:
+                logging.warning("Incremental windows are not sliced when not waiting for jobs.")
+            self.load_table_mapping(to_load, wait=False)
+            self.remember_workspace_tables(to_load)
+        elif to_load:
+            slices = self.slice_incremental_windows(to_load)
+            for number, slice_mapping in enumerate(slices, start=1):
+                if number > 1 and self.deadline is not None and time.monotonic() >= self.deadline:
+                    raise UserException(
+                        f"The run deadline passed after {number - 1} of {len(slices)} slices, "
+                        f"the next run continues from the last loaded slice."
                     )
+                if len(slices) > 1:
+                    logging.info(f"Loading slice {number} of {len(slices)}.")
+                self.load_table_mapping(slice_mapping, checkpoint_jobs=len(slices) > 1)
+                self.remember_workspace_tables(slice_mapping)
+                self.remember_loaded_tables(slice_mapping)
+                self.state.pop("pending_jobs", None)
+                if number < len(slices):
+                    self.save_state_checkpoint()
+        else:
+            logging.info("No source table changed since the last load, no storage job was submitted.")
+
+        configured = {table["destination"] for table in table_mapping}
+        for key in ("tables", "job_history"):
+            if key in self.state:
+                self.state[key] = {dest: t for dest, t in self.state[key].items() if dest in configured}
+        if "column_types" in self.state:
+            sources = {table["source"] for table in table_mapping}
+            self.state["column_types"] = {src: c for src, c in self.state["column_types"].items() if src in sources}
 
-            last_run_dt = datetime.fromtimestamp(self.start_timestamp, tz=timezone.utc)
-            self.write_state_file({"last_run": last_run_dt.astimezone().isoformat()})
+        with self.report.phase("state_write"):
+            if self.params.wait_for_jobs:
+                # submitted jobs move their watermarks only once they succeed
+                self.state["last_run"] = to_iso(self.window_until or self.start_timestamp)
+            self.write_state_file(self.state)
+
+    def load_storage_input(self) -> StorageInput:
+        return StorageInput(**self.configuration.config_data.get("storage", {}).get("input"))
+
+    def load_table_mapping(self, table_mapping: list[dict], wait: bool = True, checkpoint_jobs: bool = False):
+        """
+        Loads the mapping and fails on any failed job. Without waiting, the submitted jobs are kept in the state
+        and finished by finalize_submitted_jobs of a later run or the job_status sync action.
+        With `checkpoint_jobs`, submitted jobs are saved to the configuration state even for a single batch.
+        """
+        batches = self.split_table_mapping(table_mapping)
+        try:
+            results = self.load_batches(batches, wait=wait, checkpoint_jobs=checkpoint_jobs)
 
+            if self.workspace_id_cached and any(result.http_status == 404 for result in results):
+                logging.warning("Cached workspace was not found, resolving the workspace again.")
+                self.invalidate_workspace_id()
+                retried = iter(
+                    self.load_batches(
+                        [b for b, r in zip(batches, results) if r.http_status == 404],
+                        wait=wait,
+                        checkpoint_jobs=checkpoint_jobs,
+                    )
+                )
+                results = [next(retried) if result.http_status == 404 else result for result in results]
         except HTTPError as e:
             raise UserException(f"Loading table failed: {e.response.text}")
         except Exception as e:
             raise UserException(f"Loading table failed: {str(e)}")
 
+        for result in results:
+            if result.job.get("createdTime"):
+                created = int(datetime.fromisoformat(result.job["createdTime"]).timestamp())
+                self.job_created.update({destination: created for destination in result.tables})
+
+        if not wait:
+            self.remember_submitted_jobs(table_mapping, [result for result in results if not result.error])
+            errors = [result.error for result in results if result.error]
+            if errors:
+                self.save_state_checkpoint()
+                raise UserException(f"Loading table failed: {'; '.join(errors)}")
+            return
+
+        for result in results:
+            self.log_job_result(result)
+            self.report.add_job_result(result)
+            if result.success and not self.params.preview_rows:
+                self.record_job_history(self.state, result, table_mapping)
+            created = result.job.get("createdTime")
+            if self.window_until and created and datetime.fromisoformat(created).timestamp() < self.window_until:
+                logging.warning(
+                    f"Storage job {result.job['id']} was created before the end of the incremental window, "
+                    f"rows imported in between may be missed by the next run."
+                )
+        self.transport.log_stats()
+
+        errors = [result.error for result in results if not result.success]
+        if errors:
+            logging.debug(f"Table mapping: {table_mapping}")
+            raise UserException(f"Loading table failed: {'; '.join(errors)}")
+
+    def record_job_history(self, state: dict, result: LoadJobResult, table_mapping: list[dict]):
+        """
+        Stores the duration of a succeeded job with its tables and adds it to their rolling metrics history. Rows
+        and bytes come from the table details only when the run fetched them anyway, so the metrics do not cost
+        an extra listing of all tables.
+        """
+        sources = {table["destination"]: table["source"] for table in table_mapping}
+        for destination in result.tables:
+            if result.duration_seconds is not None:
+                state.setdefault("tables", {}).setdefault(destination, {})["job_seconds"] = round(
+                    result.duration_seconds, 1
+                )
+            detail = (self._tables_detail or {}).get(sources.get(destination), {})
+            record_job(
+                state.setdefault("job_history", {}),
+                destination,
+                {
+                    "queue_seconds": result.queue_seconds,
+                    "processing_seconds": result.processing_seconds,
+                    "rows": detail.get("rowsCount"),
+                    "bytes": detail.get("dataSizeBytes"),
+                    "polls": result.polls or None,  # jobs submitted without waiting are not polled by the run
+                },
+            )
+
+    def skip_unchanged_tables(self, table_mapping: list[dict]) -> list[dict]:
+        """
+        Drops tables whose source has not changed since their last load with the same mapping.
+        """
+        if not self.params.skip_unchanged_tables:
+            return table_mapping
+        if not self.params.preserve_existing_tables:
+            logging.warning("Unchanged tables can be skipped only with preserve_existing_tables, loading all tables.")
+            return table_mapping
+
+        tables_state = self.state.get("tables", {})
+        to_load = []
+        for table in table_mapping:
+            loaded = tables_state.get(table["destination"], {})
+            version = self.get_source_version(table["source"])
+            unchanged_mapping = loaded.get("mapping") == self.fingerprints[table["destination"]]
+            if version and loaded.get("source_version") == version and unchanged_mapping:
+                logging.info(f"Table {table['source']} has not changed since the last load, skipping.")
+                self.report.add_skipped(table["destination"])
+            else:
+                to_load.append(table)
+
+        if len(to_load) < len(table_mapping):
+            logging.info(f"Skipped {len(table_mapping) - len(to_load)} of {len(table_mapping)} unchanged tables.")
+        return to_load
+
+    def slice_incremental_windows(self, table_mapping: list[dict]) -> list[list[dict]]:
+        """
+        Splits incremental windows longer than incremental_slice_seconds into consecutive slices. The n-th
+        slice of every table goes to the n-th storage job, tables with short windows load with the first one.
+        """
+        step = self.params.incremental_slice_seconds
+        if not step:
+            return [table_mapping]
+        if not self.preserve_workspace:
+            logging.warning("Incremental windows can be sliced only with preserve_existing_tables, loading them whole.")
+            return [table_mapping]
+
+        slices: list[list[dict]] = []
+        for table in table_mapping:
+            since, until = table.get("changedSince"), table.get("changedUntil")
+            table_slices = [table]
+            if table["incremental"] and isinstance(since, int) and isinstance(until, int):
+                since = max(since, self.get_source_created(table["source"]) or since)
+                if until - since > step:
+                    table_slices = [
+                        {**table, "changedSince": start, "changedUntil": min(start + step, until)}
+                        for start in range(since, until, step)
+                    ]
+                    logging.info(f"Incremental window of {table['destination']} split into {len(table_slices)} slices.")
+            for number, table_slice in enumerate(table_slices):
+                if number == len(slices):
+                    slices.append([])
+                slices[number].append(table_slice)
+        return slices
+
+    def get_source_created(self, table_id: str) -> int | None:
+        """
+        Creation time of the source table, the earliest meaningful start of a first incremental window.
+        """
+        created = self.get_tables_detail().get(table_id, {}).get("created")
+        return int(datetime.fromisoformat(created).timestamp()) if created else None
+
+    def save_state_checkpoint(self):
+        """
+        Writes the state after a successful slice. The platform keeps the state file only from successful runs,
+        so it is also stored in the configuration state to let a failed backfill resume from this slice.
+        """
+        self.write_state_file(self.state)
+        self.update_config_state(lambda stored: self.state)
+
+    def update_config_state(self, update: Callable[[dict], dict]):
+        """
+        Replaces the component state stored in the configuration (row) with `update(stored component state)`.
+        Best effort, failures are only logged.
+        """
+        self.update_stored_state(self.get_config_row_id(), update)
+
+    def update_stored_state(self, row_id: str | None, update: Callable[[dict], dict]):
+        config_id = self.get_config_id()
+        if not config_id:
+            return
+        configurations = self.client.configurations
+        url = f"{configurations.base_url}/{COMPONENT_ID}/configs/{config_id}"
+        if row_id:
+            url = f"{url}/rows/{row_id}"
+        try:
+            stored_state = configurations._get(url).get("state") or {}
+            component_state = update(stored_state.get("component") or {})
+            state = json.dumps({**stored_state, "component": component_state})
+            configurations._put(f"{url}/state", json={"state": state})
+        except Exception as e:
+            logging.warning(f"Configuration state could not be updated: {e}")
+
+    def remember_workspace_tables(self, table_mapping: list[dict]):
+        """
+        Keeps every table ever loaded to the workspace, including previews. Unlike the per-table state, the list
+        is not pruned when a table is removed from the configuration, so stale tables can be found and dropped.
+        """
+        loaded = set(self.state.get("workspace_tables", [])) | {table["destination"] for table in table_mapping}
+        self.state["workspace_tables"] = sorted(loaded)
+
+    def remember_loaded_tables(self, table_mapping: list[dict]):
+        """
+        Stores the watermark and mapping fingerprint of every loaded table, keyed by its destination.
+        """
+        tables_state = self.state.setdefault("tables", {})
+        for table in table_mapping:
+            loaded = tables_state.setdefault(table["destination"], {})
+            loaded.update(self.loaded_table_state(table))
+            if self.params.skip_unchanged_tables:
+                # a table with more slices to load is behind its source, so the next run must not skip it
+                if table["incremental"] and table.get("changedUntil") != self.window_until:
+                    loaded.pop("source_version", None)
+                else:
+                    loaded["source_version"] = self.get_source_version(table["source"])
+            if table["destination"] in self.delta_tables:
+                loaded["rows_count"] = self.get_tables_detail().get(table["source"], {}).get("rowsCount")
+                if not table["incremental"]:
+                    loaded["full_load_at"] = loaded["watermark"]
+
+    def loaded_table_state(self, table: dict) -> dict:
+        """
+        Full loads are marked by the window end of the run or the creation of their job, both on the Storage API
+        clock which later incremental windows start from; the container clock is only the last resort.
+        """
+        watermark_ts = table.get("changedUntil") if table["incremental"] else None
+        watermark_ts = watermark_ts or self.window_until or self.job_created.get(table["destination"])
+        return {
+            "source": table["source"],
+            "mapping": self.fingerprints[table["destination"]],
+            "watermark": to_iso(watermark_ts or self.start_timestamp),
+        }
+
+    def remember_submitted_jobs(self, table_mapping: list[dict], results: list[LoadJobResult]):
+        """
+        Keeps jobs submitted without waiting with the state their tables get once the job succeeds, including
+        the source version the job loads, so the tables can be skipped as unchanged afterwards.
+        """
+        tables = {table["destination"]: table for table in table_mapping}
+        for result in results:
+            logging.info(f"Submitted storage job {result.job['id']} loading {', '.join(result.tables)}.")
+            submitted_tables = []
+            for destination in result.tables:
+                table_state = {"destination": destination, **self.loaded_table_state(tables[destination])}
+                if self.params.skip_unchanged_tables:
+                    table_state["source_version"] = self.get_source_version(tables[destination]["source"])
+                submitted_tables.append(table_state)
+            self.state.setdefault("submitted_jobs", []).append(
+                {"id": result.job["id"], "submitted_at": to_iso(self.start_timestamp), "tables": submitted_tables}
+            )
+
+    def finalize_submitted_jobs(self, state: dict) -> list[dict]:
+        """
+        Checks the jobs submitted without waiting. Only tables of succeeded jobs get their watermark moved; tables
+        of failed, unknown or too old jobs keep the previous one, so their window is loaded again. Running jobs stay
+        in the state. Returns the status of every checked job.
+        """
+        statuses, running = [], []
+        for submitted in state.get("submitted_jobs", []):
+            job = {}
+            try:
+                job = self.client.jobs.detail(submitted["id"])
+                status = job.get("status")
+            except HTTPError as e:
+                logging.warning(f"Submitted storage job {submitted['id']} could not be read: {e}")
+                status = "not_found" if e.response is not None and e.response.status_code == 404 else None
+
+            destinations = [table["destination"] for table in submitted["tables"]]
+            age = time.time() - datetime.fromisoformat(submitted["submitted_at"]).timestamp()
+            if status in ("waiting", "processing", None) and age > SUBMITTED_JOB_MAX_AGE:
+                logging.warning(f"Submitted storage job {submitted['id']} has not finished in {age / 3600:.0f} hours.")
+                status = "expired"
+
+            if status == "success":
+                tables_state = state.setdefault("tables", {})
+                for table in submitted["tables"]:
+                    tables_state.setdefault(table["destination"], {}).update(
+                        {k: v for k, v in table.items() if k != "destination"}
+                    )
+                self.record_job_history(state, LoadJobResult(tables=destinations, job=job), submitted["tables"])
+                logging.info(f"Submitted storage job {submitted['id']} loaded {', '.join(destinations)}.")
+            elif status in ("waiting", "processing") or status is None:
+                running.append(submitted)
+            else:
+                logging.warning(
+                    f"Submitted storage job {submitted['id']} ended with {status}, "
+                    f"{', '.join(destinations)} will be loaded again."
+                )
+            statuses.append(
+                {
+                    "id": submitted["id"],
+                    "status": status,
+                    "submittedAt": submitted["submitted_at"],
+                    "tables": destinations,
+                }
+            )
+        state["submitted_jobs"] = running
+        return statuses
+
+    def get_source_version(self, table_id: str) -> str | None:
+        detail = self.get_tables_detail().get(table_id)
+        if not detail or not detail.get("lastChangeDate"):
+            return None
+        return f"{detail.get('lastImportDate')}|{detail['lastChangeDate']}"
+
+    def write_run_report(self):
+        """
+        Writes timings, storage jobs and per-table results of the run to out/files for monitoring, together
+        with OpenMetrics of the job history across runs for scrapers.
+        """
+        self.report.api = asdict(self.transport.get_stats())
+        os.makedirs(self.files_out_path, exist_ok=True)
+        report_file = self.create_out_file_definition(RUN_REPORT_FILE, tags=RUN_REPORT_TAGS)
+        self.report.write(report_file.full_path)
+        self.write_manifest(report_file)
+
+        metrics_file = self.create_out_file_definition(METRICS_FILE, tags=METRICS_TAGS)
+        with open(metrics_file.full_path, "w") as metrics:
+            metrics.write(render_openmetrics(self.state.get("job_history", {})))
+        self.write_manifest(metrics_file)
+
+    def load_batches(
+        self, batches: list[list[dict]], wait: bool = True, checkpoint_jobs: bool = False
+    ) -> list[LoadJobResult]:
+        """
+        Submitted jobs are saved to the configuration state for reattaching when the run spans several jobs or
+        checkpoint_pending_jobs is set; otherwise the extra state request per submission is not worth it.
+        """
+        with self.report.phase("workspace_resolution"):
+            workspace_id = self.get_workspace_id()
+
+        checkpoint_jobs = checkpoint_jobs or len(batches) > 1 or self.params.checkpoint_pending_jobs
+
+        scheduler = LoadJobScheduler(
+            self.client,
+            workspace_id=workspace_id,
+            preserve=self.preserve_workspace,
+            parallelism=self.params.parallel_jobs,
+            waiter=JobWaiter(self.client, deadline=self.deadline),
+            journal=JobJournal(self.state, self.save_state_checkpoint if checkpoint_jobs else None) if wait else None,
+            wait=wait,
+            budgets={
+                spec.destination_table_name: spec.expected_duration_seconds
+                for spec in self.params.table_specs
+                if spec.expected_duration_seconds
+            },
+            expected={
+                destination: expected
+                for destination, history in self.state.get("job_history", {}).items()
+                if (expected := expected_duration(history))
+            },
+            deadline=self.deadline,
+        )
+        return scheduler.run(batches)
+
+    def split_table_mapping(self, table_mapping: list[dict]) -> list[list[dict]]:
+        """
+        Splits the mapping into several storage jobs when parallel loading is enabled, smallest tables first.
+        """
+        if self.params.parallel_jobs <= 1 or len(table_mapping) <= 1:
+            return [table_mapping]
+
+        if not self.preserve_workspace:
+            logging.warning("Parallel jobs require preserve_existing_tables, all tables will be loaded in one job.")
+            return [table_mapping]
+
+        sizes = {}
+        tables_detail = self.get_tables_detail()
+        for table in table_mapping:
+            if table["loadType"] == "CLONE":
+                sizes[table["destination"]] = 0  # zero-copy, finishes fast regardless of the size
+            else:
+                sizes[table["destination"]] = tables_detail.get(table["source"], {}).get("dataSizeBytes") or 0
+
+        batches = split_batches(table_mapping, sizes, self.params.tables_per_job)
+        logging.info(
+            f"Loading {len(table_mapping)} tables in {len(batches)} jobs, up to {self.params.parallel_jobs} at once."
+        )
+        return batches
+
+    def get_tables_detail(self, columns: bool = False, column_metadata: bool = False) -> dict[str, dict]:
+        """
+        Returns details (size, rows, import times) of all storage tables, fetched in one call and cached for the run.
+        With columns, column names are included, with column_metadata also their metadata, which makes the response
+        larger. The cache is fetched again only when more is requested than it holds.
+        """
+        include = ["columns", "columnMetadata"] if column_metadata else ["columns"] if columns else []
+        if self._tables_detail is None or not set(include) <= self._tables_detail_include:
+            self._tables_detail = {table["id"]: table for table in self.client.tables.list(include=include or None)}
+            self._tables_detail_include = set(include)
+        return self._tables_detail
+
+    def get_derived_columns(self, table_ids: list[str], use_cache: bool = False) -> dict[str, list[ColumnSpec]]:
+        """
+        Column specs typed from storage metadata, fetched for all tables in one call and kept in the state.
+        Cached entries younger than column_types_cache_ttl are used only with use_cache, runs always refresh them.
+        """
+        cache = self.state.setdefault("column_types", {})
+        now = int(time.time())
+        fresh = {
+            table_id: cache[table_id]["columns"]
+            for table_id in table_ids
+            if use_cache and now - cache.get(table_id, {}).get("fetched_at", 0) < self.params.column_types_cache_ttl
+        }
+        missing = [table_id for table_id in table_ids if table_id not in fresh]
+        if missing:
+            tables_detail = self.get_tables_detail(column_metadata=True)
+            for table_id in missing:
+                if table_id not in tables_detail:
+                    raise UserException(f"Table '{table_id}' not found in Storage, column types cannot be derived.")
+                columns = [column.model_dump(by_alias=True) for column in derive_columns(tables_detail[table_id])]
+                fresh[table_id] = columns
+                cache[table_id] = {"fetched_at": now, "columns": columns}
+        return {table_id: [ColumnSpec(**column) for column in fresh[table_id]] for table_id in table_ids}
+
+    @staticmethod
+    def log_job_result(result: LoadJobResult):
+        destinations = ", ".join(result.tables)
+        if not result.success:
+            logging.error(f"Load of {destinations} failed: {result.error}")
+            return
+
+        logging.info(
+            f"Load of {destinations} finished successfully. Storage job {result.job['id']} "
+            f"queued for {result.queue_seconds:.0f} s and processed for {result.processing_seconds:.0f} s, "
+            f"polled {result.polls} times over {result.waited_seconds:.1f} s."
+        )
+
     def get_workspace_id(self) -> str:
-        workspace_id = self.params.db.workspace_id
+        workspace_id = self.workspace_params.db.workspace_id
 
         if not workspace_id:  # fallback to old config version
-            config_id = self.environment_variables.config_id
-
-            if not config_id:  # for sync action
-                with open(Path(self.data_folder_path) / "config.json") as config_file:
-                    config_id = json.load(config_file).get("configId")
+            cached = self.state.get("workspace") or {}
+            cache_age = time.time() - cached.get("resolved_at", 0)
+            if cached.get("id") and cache_age < self.workspace_params.workspace_cache_ttl:
+                self.workspace_id_cached = True
+                return cached["id"]
 
+            config_id = self.get_config_id()
             workspaces = self.client.configurations.list_config_workspaces(
-                "keboola.app-data-gateway",
+                COMPONENT_ID,
                 config_id=config_id,
             )
 
@@ -106,102 +649,455 @@ class Component(ComponentBase):
                 raise UserException("No workspaces found for this configuration, please create workspace first.")
 
             workspace_id = workspaces[-1].get("id")  # get the id of latest created workspace
+            self.state["workspace"] = {"id": workspace_id, "resolved_at": int(time.time())}
         return workspace_id
 
-    def get_time_range(self, changed_since):
+    def get_config_id(self) -> str | None:
+        config_id = self.environment_variables.config_id
+        if not config_id:  # for sync action
+            config_id = self.configuration.config_data.get("configId")
+        return config_id
+
+    def get_config_row_id(self) -> str | None:
+        row_id = self.environment_variables.config_row_id
+        if not row_id:  # for sync action
+            row_id = self.configuration.config_data.get("configRowId")
+        return row_id
+
+    def invalidate_workspace_id(self):
+        self.state.pop("workspace", None)
+        self.workspace_id_cached = False
+
+    def get_time_range(self, changed_since, destination: str | None = None):
         if changed_since == "adaptive":
-            last_run = self.state.get("last_run")
+            last_run = self.get_watermark(destination)
             if not last_run:
                 since = 1
             else:
                 since = parse_last_run_to_timestamp(last_run)
         else:
-            # Manual incremental load (e.g., "-30 minutes")
+            # Manual incremental load (e.g., "-30 minutes"), keboola.utils loads dateparser which is slow to import
+            from keboola.utils import get_past_date
+
             since_datetime = get_past_date(changed_since)
             since = int(since_datetime.timestamp())
 
-        return since, self.start_timestamp
+        if self.window_until is None:
+            self.window_until = self.get_server_timestamp()
+        return since, self.window_until
+
+    def get_server_timestamp(self) -> int:
+        """
+        Current time on the Storage API clock, so that window bounds match the row timestamps set by Storage
+        regardless of the container clock. The same bound is saved as the next run's start of the window.
+        """
+        server_time = self.transport.server_time()
+        if server_time is None:
+            try:
+                self.client.tokens.verify()
+            except Exception as e:
+                logging.debug(f"Token verification failed: {e}")
+            server_time = self.transport.server_time()
+
+        if server_time is None:
+            logging.warning("Storage API time is not available, the incremental window ends at the local time.")
+            return self.start_timestamp
+
+        if abs(server_time - self.start_timestamp) > 5:
+            logging.info(f"Container clock differs from Storage API clock by {self.start_timestamp - server_time} s.")
+        return server_time
+
+    def get_watermark(self, destination: str | None):
+        """
+        Returns the end of the last loaded window of the table. States written before per-table
+        watermarks only have the global "last_run", which is used until any table watermark exists.
+        """
+        tables_state = self.state.get("tables", {})
+        if destination in tables_state and tables_state[destination].get("watermark"):
+            return tables_state[destination]["watermark"]
+        if not any(table.get("watermark") for table in tables_state.values()):
+            return self.state.get("last_run")
+        return None
+
+    @staticmethod
+    def column_mapping(column: ColumnSpec) -> dict:
+        """
+        Load payload of one column, equal to the by-alias dump of the matching Column model.
+        """
+        return {
+            "source": column.name,
+            "destination": column.dbName,
+            "type": column.type,
+            "length": column.size,
+            "nullable": column.nullable,
+            "convertEmptyValuesToNull": column.nullable,  # design decision to use the same "nullable" param
+        }
+
+    @staticmethod
+    def table_fingerprint(tbl: Table, columns: list[dict]) -> str:
+        """
+        Fingerprint of what the table looks like in the workspace. Incremental flag and window are left out,
+        so switching between full and incremental loads keeps the watermark.
+        """
+        data = tbl.model_dump(by_alias=True, exclude={"changed_since", "changed_until", "incremental", "overwrite"})
+        data["columns"] = columns
+        return fingerprint(data)
+
+    def has_history(self, tbl: Table, columns: list[dict]) -> bool:
+        loaded = self.state.get("tables", {}).get(tbl.destination, {})
+        return bool(loaded.get("watermark")) and loaded.get("mapping") == self.table_fingerprint(tbl, columns)
+
+    def mapping_changed(self, destination: str) -> bool:
+        loaded_mapping = self.state.get("tables", {}).get(destination, {}).get("mapping")
+        return loaded_mapping is not None and loaded_mapping != self.fingerprints[destination]
 
     def build_table_mapping(self) -> list[dict]:
+        """
+        Builds one table mapping covering all tables from the configuration, so they are loaded in a single job.
+        """
+        destinations = [spec.destination_table_name for spec in self.params.table_specs]
+        duplicates = sorted({name for name in destinations if destinations.count(name) > 1})
+        if duplicates:
+            raise UserException(f"Destination table names must be unique, duplicated: {', '.join(duplicates)}")
+
+        specs = self.params.table_specs
+        to_derive = [spec.table_id for spec in specs if self.needs_derived_columns(spec)]
+        if to_derive:
+            derived = self.get_derived_columns(to_derive)
+            specs = [
+                spec.model_copy(update={"items": derived[spec.table_id]}) if self.needs_derived_columns(spec) else spec
+                for spec in specs
+            ]
+            logging.info(f"Column types of {', '.join(to_derive)} derived from storage metadata.")
+
+        return [self.build_table(spec) for spec in specs]
+
+    @staticmethod
+    def needs_derived_columns(spec: TableSpec) -> bool:
+        return spec.derive_column_types and not spec.items and not spec.clone
+
+    def build_table(self, spec: TableSpec) -> dict:
         """
         Combines the input table with the columns specified in the configuration.
         Table name from configuration will always match one of the input tables.
         """
-        matching_tables = [table for table in self.storage_input.tables if table.source == self.params.table_id]
+        matching_tables = [table for table in self.storage_input.tables if table.source == spec.table_id]
         if not matching_tables:
             available = [table.source for table in self.storage_input.tables]
             raise UserException(
-                f"Table '{self.params.table_id}' not found in the input mapping. "
+                f"Table '{spec.table_id}' not found in the input mapping. "
                 f"Available tables: {available}. "
                 f"Please update the input mapping or the component configuration."
             )
-        tbl = matching_tables[0]
-        tbl.destination = self.params.destination_table_name
-        tbl.primary_key.columns = self.params.primary_key
-        tbl.incremental = self.params.incremental
-
-        if self.params.clone:
-            tbl.load_type = "CLONE"
-
-        if tbl.incremental:
-            tbl.changed_since, tbl.changed_until = self.get_time_range(tbl.changed_since)
-        else:
-            tbl.overwrite = True
+        tbl = matching_tables[0].model_copy(deep=True)
+        tbl.destination = spec.destination_table_name
+        tbl.primary_key.columns = spec.primary_key
 
+        # column specs are validated by Configuration already, so the payload is built without another model
         tbl.columns = []
-        for column in self.params.items:
-            tbl.columns.append(
-                Column(
-                    source=column.name,
-                    destination=column.dbName,
-                    type=column.type,
-                    length=column.size,
-                    nullable=column.nullable,
-                    convert_empty_values_to_null=column.nullable,  # design decision to use the same "nullable" param
-                )
-            )
+        columns = [self.column_mapping(column) for column in spec.items]
 
         # Validate primary key columns are in selected columns
-        if self.params.primary_key:
-            dest_column_names = {column.dbName for column in self.params.items}
-            missing_columns = [pk for pk in self.params.primary_key if pk not in dest_column_names]
+        if spec.primary_key:
+            dest_column_names = {column.dbName for column in spec.items}
+            missing_columns = [pk for pk in spec.primary_key if pk not in dest_column_names]
             if missing_columns:
                 raise UserException(f"Primary key columns not in selected columns: {', '.join(missing_columns)}")
 
-        in_table = StorageInput(tables=[tbl]).model_dump(by_alias=True)["tables"]
+        if spec.where_column:
+            self.validate_row_filter(spec)
+            tbl.where_column = spec.where_column
+            tbl.where_values = spec.where_values
+            tbl.where_operator = spec.where_operator
+
+        if self.params.preview_rows:
+            tbl.destination += PREVIEW_SUFFIX
+            tbl.load_type = "COPY"
+            tbl.incremental = False
+            tbl.changed_since = tbl.changed_until = None
+        elif spec.load_strategy == "auto":
+            table_detail = self.get_tables_detail(columns=True).get(tbl.source)
+            preserve = self.params.preserve_existing_tables
+            plan = plan_load(
+                spec, table_detail, self.has_history(tbl, columns), filtered=bool(tbl.where_column), preserve=preserve
+            )
+            if plan.load_type == "COPY" and spec.primary_key and preserve:
+                # incremental loads are guarded against deleted rows and drift like delta full loads
+                delta = self.plan_delta_load(spec, tbl, columns)
+                if plan.incremental and not delta.incremental:
+                    plan = LoadPlan("COPY", False, delta.reason)
+            logging.info(
+                f"Auto load strategy for {tbl.source}: {plan.load_type}"
+                f"{' incremental' if plan.incremental else ''} ({plan.reason})."
+            )
+            tbl.load_type = plan.load_type
+            tbl.incremental = plan.incremental
+            if tbl.incremental:
+                tbl.changed_since = "adaptive"
+        else:
+            tbl.incremental = spec.incremental
+            if spec.clone:
+                tbl.load_type = "CLONE"
+            elif not spec.incremental and spec.full_load_mode == "delta" and self.params.preserve_existing_tables:
+                plan = self.plan_delta_load(spec, tbl, columns)
+                logging.info(
+                    f"Delta full load of {tbl.source}: "
+                    f"{'incremental upsert' if plan.incremental else 'full overwrite'} ({plan.reason})."
+                )
+                tbl.incremental = plan.incremental
+                if tbl.incremental:
+                    tbl.changed_since = "adaptive"
+
+        self.fingerprints[tbl.destination] = self.table_fingerprint(tbl, columns)
+        if tbl.incremental and self.mapping_changed(tbl.destination):
+            logging.warning(
+                f"Mapping of {tbl.source} to {tbl.destination} changed since the last load, "
+                f"the table will be fully reloaded."
+            )
+            tbl.incremental = False
+            tbl.changed_since = tbl.changed_until = None
+
+        if tbl.incremental:
+            tbl.changed_since, tbl.changed_until = self.get_time_range(tbl.changed_since, tbl.destination)
+        else:
+            tbl.overwrite = True
+
+        in_table = tbl.model_dump(by_alias=True)
+        in_table["columns"] = columns
+        if self.params.preview_rows:
+            in_table["rows"] = self.params.preview_rows
 
-        if not self.params.preserve_existing_tables or self.params.incremental:
-            in_table[0].pop("overwrite")  # supported by API only if preserve is true
+        if not self.preserve_workspace or tbl.incremental:
+            in_table.pop("overwrite")  # supported by API only if preserve is true
 
-        if not self.params.clone:
-            in_table[0].pop("dropTimestampColumn")
+        if tbl.load_type != "CLONE":
+            in_table.pop("dropTimestampColumn")
 
         return in_table
 
+    def plan_delta_load(self, spec: TableSpec, tbl: Table, columns: list[dict]) -> LoadPlan:
+        """
+        Plans an upsert of a full load and tracks the row count and full load time the next plan is based on.
+        """
+        self.delta_tables.add(tbl.destination)
+        return plan_delta_load(
+            spec,
+            self.get_tables_detail().get(tbl.source),
+            self.state.get("tables", {}).get(tbl.destination, {}),
+            self.has_history(tbl, columns),
+            self.params.delta_max_changed_fraction,
+            self.params.delta_full_reload_days,
+            now=datetime.now(timezone.utc),
+        )
+
+    @staticmethod
+    def validate_row_filter(spec: TableSpec):
+        """
+        Row filters need values, a column among the selected ones and a COPY load, as CLONE copies whole tables.
+        """
+        if not spec.where_values:
+            raise UserException(f"Row filter of {spec.table_id} on '{spec.where_column}' has no values.")
+        if spec.items and spec.where_column not in {column.name for column in spec.items}:
+            raise UserException(f"Row filter column '{spec.where_column}' of {spec.table_id} is not a selected column.")
+        if spec.clone and spec.load_strategy == "manual":
+            raise UserException(f"Row filter of {spec.table_id} cannot be used with clone, use a COPY load.")
+
     @sync_action("clean_workspace")
     def clean_workspace(self):
+        return self.wipe_workspace("Workspace cleaned successfully")
+
+    @sync_action("list_stale_tables")
+    def list_stale_tables(self):
+        """
+        Dry run of clean_stale_tables: workspace tables which neither this configuration nor any of its rows
+        configures, and the configured tables which are kept.
+        """
+        return self.find_stale_tables()
+
+    @sync_action("clean_stale_tables")
+    def clean_stale_tables(self):
+        """
+        Resets the whole workspace when it holds stale tables. Storage API cannot drop single workspace tables,
+        so every configuration then reloads its tables fully on the next run; this needs confirm_workspace_reset.
+        """
         try:
-            job = self.client.workspaces.load_tables(
-                workspace_id=self.get_workspace_id(),
-                table_mapping=[],
-                preserve=False,
-                load_type="load",
+            stale = self.find_stale_tables()
+        except Exception as e:
+            return ValidationResult(f"{str(e)}", MessageType.ERROR)
+        if not stale["remove"]:
+            return ValidationResult("No stale tables in the workspace, nothing to clean.", MessageType.SUCCESS)
+        if not self.workspace_params.confirm_workspace_reset:
+            return ValidationResult(
+                f"Stale tables {', '.join(stale['remove'])} can be dropped only by resetting the whole workspace, "
+                f"after which tables {', '.join(stale['keep']) or 'none'} are fully reloaded by their next runs. "
+                f"Set confirm_workspace_reset to reset it.",
+                MessageType.WARNING,
             )
+        return self.wipe_workspace(
+            f"Dropped stale tables {', '.join(stale['remove'])}. "
+            f"Tables {', '.join(stale['keep']) or 'none'} will be fully reloaded by their next runs."
+        )
+
+    def find_stale_tables(self) -> dict[str, list[str]]:
+        """
+        Diffs the tables the workspace holds against the destinations of the configuration and its rows, so tables
+        of deleted rows are found too. When the workspace cannot be queried, the tables recorded in the state of
+        the existing configuration and rows are used instead.
+        """
+        config = self.client.configurations.detail(COMPONENT_ID, self.get_config_id())
+        configured, loaded = set(), set()
+        for entry in [config, *config.get("rows", [])]:
+            parameters = (entry.get("configuration") or {}).get("parameters") or {}
+            if parameters.get("tableId") or parameters.get("tables"):
+                configured |= {spec.destination_table_name for spec in Configuration(**parameters).table_specs}
+            component_state = (entry.get("state") or {}).get("component") or {}
+            loaded |= set(component_state.get("workspace_tables", [])) | set(component_state.get("tables", {}))
+        try:
+            loaded = self.list_workspace_tables()
+        except (HTTPError, WorkspaceQueryError, KeyError) as e:
+            logging.warning(f"Workspace tables could not be listed, using the tables recorded in the state: {e}")
+        return {"remove": sorted(loaded - configured), "keep": sorted(configured & loaded)}
+
+    def list_workspace_tables(self) -> set[str]:
+        workspace_id = self.get_workspace_id()
+        connection = self.client.workspaces.detail(workspace_id)["connection"]
+        query = WorkspaceQuery(self.transport, self.environment_variables.url, self.environment_variables.token)
+        rows = query.execute(self.get_branch_id(), workspace_id, list_tables_statement(connection))
+        return {row[0] for row in rows}
+
+    def get_branch_id(self) -> str:
+        branch_id = self.environment_variables.branch_id
+        if branch_id and branch_id != "default":
+            return branch_id
+        branches = self.client.branches._get(f"{self.client.branches.base_url}dev-branches")
+        return str(next(branch["id"] for branch in branches if branch.get("isDefault")))
+
+    def wipe_workspace(self, success_message: str) -> ValidationResult:
+        """
+        Drops all tables of the workspace and forgets the loaded tables in the state of the configuration and
+        its rows, so that incremental tables are not appended to tables which no longer exist.
+        """
+        try:
+            try:
+                job = self.submit_clean_job()
+            except HTTPError as e:
+                if not (self.workspace_id_cached and e.response.status_code == 404):
+                    raise
+                self.invalidate_workspace_id()
+                job = self.submit_clean_job()
 
         except Exception as e:
             return ValidationResult(f"{str(e)}", MessageType.ERROR)
 
-        while True:
-            job = self.client.jobs.detail(job["id"])
-            if job["status"] in ["success", "error"]:
-                break
-            time.sleep(1)
+        job = JobWaiter(self.client, initial_interval=0.2, max_interval=5.0).wait(job["id"]).job
 
-        if job["status"] == "success":
-            return ValidationResult("Workspace cleaned successfully", MessageType.SUCCESS)
-        else:
+        if job["status"] != "success":
             return ValidationResult(f"{job.get('error', {}).get('message')}", MessageType.ERROR)
 
+        self.forget_loaded_tables()
+        return ValidationResult(success_message, MessageType.SUCCESS)
+
+    def forget_loaded_tables(self):
+        if not self.get_config_id():
+            return
+        try:
+            config = self.client.configurations.detail(COMPONENT_ID, self.get_config_id())
+        except Exception as e:
+            logging.warning(f"Loaded tables could not be reset in the configuration state: {e}")
+            return
+        for row_id in [None, *(row["id"] for row in config.get("rows", []))]:
+            self.update_stored_state(row_id, lambda stored: {k: v for k, v in stored.items() if k not in LOAD_STATE})
+
+    @sync_action("job_status")
+    def job_status(self):
+        """
+        Status of the storage jobs submitted without waiting. Tables of finished jobs are recorded in the
+        configuration state right away, as the next run would do.
+        """
+        statuses = []
+
+        def finalize(stored: dict) -> dict:
+            statuses.extend(self.finalize_submitted_jobs(stored))
+            return stored
+
+        self.update_config_state(finalize)
+        return {"jobs": statuses}
+
+    @sync_action("derive_column_types")
+    def derive_column_types(self):
+        """
+        Returns column specs typed from storage metadata for every configured table, to prefill the items in the UI.
+        Metadata is cached in the configuration state, so repeated calls do not query Storage API.
+        """
+        table_ids = [spec.table_id for spec in self.params.table_specs]
+        derived = self.get_derived_columns(table_ids, use_cache=True)
+        if self._tables_detail is not None:
+            fetched = {table_id: self.state["column_types"][table_id] for table_id in table_ids}
+            self.update_config_state(
+                lambda stored: {**stored, "column_types": {**stored.get("column_types", {}), **fetched}}
+            )
+        return {
+            "tables": [
+                {"tableId": table_id, "items": [column.model_dump(by_alias=True) for column in derived[table_id]]}
+                for table_id in table_ids
+            ]
+        }
+
+    @sync_action("plan")
+    def plan(self):
+        """
+        Dry run: builds the payload `run` would submit, including incremental windows and skipped tables,
+        without submitting it. Sizes come from table metadata; for incremental or filtered loads they are upper bounds.
+        The duration estimate is the longest duration of the jobs which loaded the tables last time.
+        """
+        self.storage_input = self.load_storage_input()
+        if not self.storage_input.tables:
+            raise UserException("No tables found. Please add one to the input mapping.")
+        self.start_timestamp = int(time.time())
+
+        table_mapping = self.build_table_mapping()
+        to_load = self.skip_unchanged_tables(table_mapping)
+        tables_detail = self.get_tables_detail()
+        tables_state = self.state.get("tables", {})
+
+        tables = []
+        for table in table_mapping:
+            detail = tables_detail.get(table["source"], {})
+            tables.append(
+                {
+                    "source": table["source"],
+                    "destination": table["destination"],
+                    "load_type": table["loadType"],
+                    "incremental": table["incremental"],
+                    "changed_since": table.get("changedSince"),
+                    "changed_until": table.get("changedUntil"),
+                    "skipped": table not in to_load,
+                    "estimated_rows": detail.get("rowsCount"),
+                    "estimated_bytes": detail.get("dataSizeBytes"),
+                    "estimated_seconds": tables_state.get(table["destination"], {}).get("job_seconds"),
+                }
+            )
+
+        loaded = [table for table in tables if not table["skipped"]]
+        durations = [table["estimated_seconds"] for table in loaded if table["estimated_seconds"] is not None]
+        return {
+            "mapping": to_load,
+            "jobs": len(self.split_table_mapping(to_load)) if to_load else 0,
+            "slices": len(self.slice_incremental_windows(to_load)) if to_load else 0,
+            "tables": tables,
+            "estimated_rows": sum(table["estimated_rows"] or 0 for table in loaded),
+            "estimated_bytes": sum(table["estimated_bytes"] or 0 for table in loaded),
+            "estimated_seconds": max(durations) if durations else None,
+        }
+
+    def submit_clean_job(self) -> dict:
+        return self.client.workspaces.load_tables(
+            workspace_id=self.get_workspace_id(),
+            table_mapping=[],
+            preserve=False,
+            load_type="load",
+        )
+
 
 """
         Main entrypoint
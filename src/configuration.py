@@ -1,4 +1,6 @@
 import logging
+from typing import Literal
+
 from pydantic import BaseModel, Field, ValidationError
 from keboola.component.exceptions import UserException
 
@@ -16,16 +18,31 @@ class ColumnSpec(BaseModel):
     size: str = ""
 
 
-class Configuration(BaseModel):
-    db: Db = Field(default_factory=Db)
+class TableSpec(BaseModel):
     table_id: str = Field(alias="tableId", default="")
     incremental: bool = False
     destination_table_name: str = Field(alias="dbName", default="")
-    preserve_existing_tables: bool = True
-    debug: bool = False
     items: list[ColumnSpec] = []
     clone: bool = False
     primary_key: list[str] = Field(alias="primaryKey", default=[])
+    load_strategy: Literal["manual", "auto"] = "manual"
+    full_load_mode: Literal["overwrite", "delta"] = "overwrite"
+    derive_column_types: bool = False
+    where_column: str | None = Field(alias="whereColumn", default=None)
+    where_values: list[str] = Field(alias="whereValues", default=[])
+    where_operator: Literal["eq", "ne"] = Field(alias="whereOperator", default="eq")
+    expected_duration_seconds: int = Field(default=0, ge=0)
+
+
+class WorkspaceConfiguration(BaseModel):
+    """
+    Parameters needed to resolve the workspace. Sync actions validate only these, not the column mappings.
+    """
+
+    db: Db = Field(default_factory=Db)
+    debug: bool = False
+    workspace_cache_ttl: int = Field(default=3600, ge=0)
+    confirm_workspace_reset: bool = False
 
     def __init__(self, **data):
         try:
@@ -36,3 +53,26 @@ class Configuration(BaseModel):
 
         if self.debug:
             logging.debug("Component will run in Debug mode")
+
+
+class Configuration(TableSpec, WorkspaceConfiguration):
+    preserve_existing_tables: bool = True
+    tables: list[TableSpec] = []
+    parallel_jobs: int = Field(default=1, ge=1)
+    tables_per_job: int = Field(default=1, ge=1)
+    skip_unchanged_tables: bool = False
+    incremental_slice_seconds: int = Field(default=0, ge=0)
+    column_types_cache_ttl: int = Field(default=3600, ge=0)
+    preview_rows: int = Field(default=0, ge=0)
+    delta_max_changed_fraction: float = Field(default=0.1, ge=0, le=1)
+    delta_full_reload_days: int = Field(default=7, ge=1)
+    wait_for_jobs: bool = True
+    run_timeout_seconds: int = Field(default=0, ge=0)
+    checkpoint_pending_jobs: bool = False
+
+    @property
+    def table_specs(self) -> list[TableSpec]:
+        """
+        Tables to be loaded. When the multi-table "tables" list is not set, the row itself is the only table.
+        """
+        return self.tables or [self]
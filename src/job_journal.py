@@ -0,0 +1,86 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Callable
+
+from requests import HTTPError
+
+# jobs in these states are adopted by a restarted run instead of being submitted again
+ADOPTABLE_STATUSES = ("waiting", "processing", "success")
+# a job which succeeded longer ago was left by an earlier failed run, its data is outdated for the current one
+SUCCESS_ADOPTION_TTL = 3600
+
+
+class JobJournal:
+    """
+    Keeps submitted load jobs in the component state until their tables are remembered as loaded, so a run
+    restarted while polling reattaches to the running job instead of submitting a competing duplicate.
+    Jobs are matched by a hash of the workspace and mapping without the window end, which moves with every run.
+    Without `save`, jobs are kept only in the state in memory and a restarted run cannot reattach to them.
+    """
+
+    def __init__(self, state: dict, save: Callable[[], None] | None = None):
+        self.state = state
+        self.save = save
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(workspace_id, preserve: bool, batch: list[dict]) -> str:
+        mapping = [{k: v for k, v in table.items() if k != "changedUntil"} for table in batch]
+        data = {"workspace": str(workspace_id), "preserve": preserve, "input": mapping}
+        return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()[:16]
+
+    def reattach(self, client, key: str, batch: list[dict]) -> dict | None:
+        """
+        Returns the job submitted for the same mapping by a previous run if it is still running or succeeded.
+        The batch then takes over the window end of that job, so watermarks match the data it loads.
+        """
+        pending = self.state.get("pending_jobs", {}).get(key)
+        if not pending:
+            return None
+        try:
+            job = client.jobs.detail(pending["id"])
+        except HTTPError as e:
+            logging.warning(f"Pending storage job {pending['id']} could not be read, submitting a new one: {e}")
+            return None
+        if job.get("status") not in ADOPTABLE_STATUSES:
+            logging.info(f"Pending storage job {pending['id']} ended with {job.get('status')}, submitting a new one.")
+            return None
+        if job["status"] == "success" and time.time() - pending.get("submitted_at", 0) > SUCCESS_ADOPTION_TTL:
+            logging.info(f"Pending storage job {pending['id']} succeeded too long ago, submitting a new one.")
+            return None
+
+        for table in batch:
+            if table["destination"] in pending.get("windows", {}):
+                table["changedUntil"] = pending["windows"][table["destination"]]
+        logging.info(f"Reattached to storage job {pending['id']} submitted by a previous run.")
+        return job
+
+    def record(self, key: str, job_id, batch: list[dict]):
+        windows = {table["destination"]: table["changedUntil"] for table in batch if table.get("changedUntil")}
+        with self.lock:
+            self.state.setdefault("pending_jobs", {})[key] = {
+                "id": job_id,
+                "windows": windows,
+                "submitted_at": int(time.time()),
+            }
+            if self.save:
+                self.save()
+
+    def discard(self, key: str):
+        with self.lock:
+            self.state.get("pending_jobs", {}).pop(key, None)
+
+    def forget(self, keys: list[str]):
+        """
+        Discards the jobs and saves the state, for succeeded jobs whose run fails before their tables are remembered.
+        """
+        if not keys:
+            return
+        with self.lock:
+            for key in keys:
+                self.state.get("pending_jobs", {}).pop(key, None)
+            if self.save:
+                self.save()
@@ -0,0 +1,105 @@
+import math
+
+# jobs kept per destination table, older samples roll out of the history
+HISTORY_SIZE = 50
+PREFIX = "data_gateway_job"
+LATENCY_BUCKETS = (1, 5, 15, 60, 300, 900, 3600)
+QUANTILES = (0.5, 0.9, 0.99)
+# fewer jobs than this are too noisy to predict the next one from
+MIN_PREDICTION_SAMPLES = 3
+
+HISTOGRAMS = {
+    "queue_seconds": "Time storage jobs spent queued",
+    "processing_seconds": "Time storage jobs spent processing",
+}
+# family name, history key, unit, help
+SUMMARIES = (
+    ("queue_summary_seconds", "queue_seconds", "seconds", "Queue time percentiles of storage jobs"),
+    ("processing_summary_seconds", "processing_seconds", "seconds", "Processing time percentiles of storage jobs"),
+    ("rows", "rows", None, "Rows of the source table when it was loaded"),
+    ("bytes", "bytes", "bytes", "Size of the source table when it was loaded"),
+    ("polls", "polls", None, "Job detail requests made while waiting for storage jobs"),
+)
+
+
+def record_job(history: dict, destination: str, sample: dict[str, float | None]):
+    """
+    Appends the known values of one job to the rolling history of the destination table.
+    Every metric keeps its own list, so a value missing for some jobs does not shift the others.
+    """
+    table_history = history.setdefault(destination, {})
+    for name, value in sample.items():
+        if value is None:
+            continue
+        values = table_history.setdefault(name, [])
+        values.append(value)
+        del values[:-HISTORY_SIZE]
+
+
+def quantile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(math.ceil(q * len(ordered)) - 1, 0)]
+
+
+def expected_duration(table_history: dict) -> float | None:
+    """
+    Median queue plus median processing time of the recent jobs of a table, None with too short a history.
+    """
+    queue, processing = table_history.get("queue_seconds", []), table_history.get("processing_seconds", [])
+    if min(len(queue), len(processing)) < MIN_PREDICTION_SAMPLES:
+        return None
+    return quantile(queue, 0.5) + quantile(processing, 0.5)
+
+
+def render_openmetrics(history: dict) -> str:
+    """
+    OpenMetrics text exposition of the history: latency histograms and percentile summaries per destination table.
+    Counts and sums cover the jobs kept in the history, not all jobs ever run.
+    """
+    lines = []
+    for name, description in HISTOGRAMS.items():
+        family = f"{PREFIX}_{name}"
+        lines += _family_header(family, "histogram", "seconds", f"{description}, last {HISTORY_SIZE} jobs per table.")
+        for labels, values in _series(history, name):
+            for bound in LATENCY_BUCKETS:
+                count = sum(1 for value in values if value <= bound)
+                lines.append(f'{family}_bucket{{{labels},le="{float(bound)}"}} {count}')
+            lines.append(f'{family}_bucket{{{labels},le="+Inf"}} {len(values)}')
+            lines += _count_and_sum(family, labels, values)
+
+    for name, key, unit, description in SUMMARIES:
+        family = f"{PREFIX}_{name}"
+        lines += _family_header(family, "summary", unit, f"{description}, last {HISTORY_SIZE} jobs per table.")
+        for labels, values in _series(history, key):
+            for q in QUANTILES:
+                lines.append(f'{family}{{{labels},quantile="{q}"}} {_format(quantile(values, q))}')
+            lines += _count_and_sum(family, labels, values)
+
+    lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+def _family_header(family: str, metric_type: str, unit: str | None, description: str) -> list[str]:
+    header = [f"# TYPE {family} {metric_type}"]
+    if unit:
+        header.append(f"# UNIT {family} {unit}")
+    header.append(f"# HELP {family} {description}")
+    return header
+
+
+def _series(history: dict, key: str):
+    for destination, table_history in sorted(history.items()):
+        if table_history.get(key):
+            yield f'table="{_escape(destination)}"', table_history[key]
+
+
+def _count_and_sum(family: str, labels: str, values: list[float]) -> list[str]:
+    return [f"{family}_count{{{labels}}} {len(values)}", f"{family}_sum{{{labels}}} {_format(sum(values))}"]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else str(round(value, 3))
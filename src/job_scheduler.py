@@ -0,0 +1,172 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from requests import HTTPError
+
+from job_journal import JobJournal
+from job_waiter import JobWaiter, JobWaitTimeout
+
+
+@dataclass
+class LoadJobResult:
+    tables: list[str]
+    job: dict = field(default_factory=dict)
+    polls: int = 0
+    waited_seconds: float = 0.0
+    error: str | None = None
+    http_status: int | None = None
+    submit_seconds: float | None = None
+
+    @property
+    def success(self) -> bool:
+        return self.error is None and self.job.get("status") == "success"
+
+    @property
+    def queue_seconds(self) -> float | None:
+        return self.job_duration("createdTime", "startTime")
+
+    @property
+    def processing_seconds(self) -> float | None:
+        return self.job_duration("startTime", "endTime")
+
+    @property
+    def duration_seconds(self) -> float | None:
+        return self.job_duration("createdTime", "endTime")
+
+    def job_duration(self, start_key: str, end_key: str) -> float | None:
+        if not self.job.get(start_key) or not self.job.get(end_key):
+            return None
+        start = datetime.fromisoformat(self.job[start_key])
+        end = datetime.fromisoformat(self.job[end_key])
+        return (end - start).total_seconds()
+
+
+class LoadJobScheduler:
+    """
+    Submits batches of the table mapping as separate workspace load jobs, keeping up to `parallelism`
+    of them running at once. Batches are submitted in the given order, so callers put small tables first.
+    With a journal, submitted jobs are recorded and a batch already submitted by a previous run is reattached.
+    Without waiting, the results hold the jobs as submitted and their completion is left to the caller.
+    Jobs still running when the waiter times out are cancelled and no new job is submitted once the `deadline`,
+    a time.monotonic() value, has passed. `budgets` are expected job durations in seconds
+    per destination, a job running longer than the largest budget of its tables is logged. `expected` are job
+    durations predicted from previous runs per destination, they schedule the polls of newly submitted jobs.
+    """
+
+    def __init__(
+        self,
+        client,
+        workspace_id,
+        preserve: bool,
+        parallelism: int = 1,
+        waiter: JobWaiter | None = None,
+        journal: JobJournal | None = None,
+        wait: bool = True,
+        budgets: dict[str, float] | None = None,
+        expected: dict[str, float] | None = None,
+        deadline: float | None = None,
+    ):
+        self.client = client
+        self.workspace_id = workspace_id
+        self.preserve = preserve
+        self.parallelism = max(parallelism, 1)
+        self.waiter = waiter or JobWaiter(client)
+        self.journal = journal
+        self.wait = wait
+        self.budgets = budgets or {}
+        self.expected = expected or {}
+        self.deadline = deadline
+
+    def run(self, batches: list[list[dict]]) -> list[LoadJobResult]:
+        if len(batches) == 1:
+            results = [self.load_batch(batches[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=self.parallelism, thread_name_prefix="load-job") as executor:
+                results = list(executor.map(self.load_batch, batches))
+
+        if self.journal and not all(result.success for result in results):
+            # a failed batch fails the run, so the succeeded ones must not be adopted by a later run instead of loading
+            self.journal.forget(
+                [
+                    self.journal.key(self.workspace_id, self.preserve, batch)
+                    for batch, result in zip(batches, results)
+                    if result.success
+                ]
+            )
+        return results
+
+    def load_batch(self, batch: list[dict]) -> LoadJobResult:
+        result = LoadJobResult(tables=[table["destination"] for table in batch])
+        key = self.journal.key(self.workspace_id, self.preserve, batch) if self.journal else None
+        try:
+            job = self.journal.reattach(self.client, key, batch) if self.journal else None
+            # a reattached job has been running for an unknown time, so its finish cannot be predicted
+            expected = None if job else max((self.expected.get(t["destination"], 0) for t in batch), default=0)
+            if not job:
+                if self.deadline is not None and time.monotonic() >= self.deadline:
+                    # a job submitted now could only be cancelled again
+                    result.error = "The run deadline passed before the job was submitted"
+                    return result
+                submitted = time.perf_counter()
+                job = self.client.workspaces.load_tables(
+                    workspace_id=self.workspace_id,
+                    table_mapping=batch,
+                    preserve=self.preserve,
+                )
+                result.submit_seconds = round(time.perf_counter() - submitted, 3)
+                if self.journal:
+                    self.journal.record(key, job["id"], batch)
+            logging.debug(batch)
+            logging.debug(job)
+            if not self.wait:
+                result.job = job
+                return result
+
+            budget = max((self.budgets.get(table["destination"], 0) for table in batch), default=0)
+            wait_result = self.waiter.wait(job["id"], budget=budget or None, expected=expected or None)
+        except JobWaitTimeout as e:
+            if self.cancel(job["id"]):
+                result.error = f"{e}. The job was cancelled."
+                if self.journal:
+                    self.journal.discard(key)
+            else:
+                result.error = f"{e}. The job could not be cancelled and may still finish."
+            return result
+        except HTTPError as e:
+            result.error = e.response.text
+            result.http_status = e.response.status_code
+            return result
+        except Exception as e:
+            result.error = str(e)
+            return result
+
+        result.job = wait_result.job
+        result.polls = wait_result.polls
+        result.waited_seconds = wait_result.waited_seconds
+        if result.job["status"] == "error":
+            result.error = f"Job {result.job['id']} failed with error: {result.job.get('error', {}).get('message')}"
+            if self.journal:
+                self.journal.discard(key)
+        return result
+
+    def cancel(self, job_id) -> bool:
+        # the storage client has no method for this endpoint
+        jobs = self.client.jobs
+        try:
+            jobs._post(f"{jobs.base_url}/{job_id}/kill")
+        except Exception as e:
+            logging.warning(f"Storage job {job_id} could not be cancelled: {e}")
+            return False
+        return True
+
+
+def split_batches(table_mapping: list[dict], sizes: dict[str, int], tables_per_job: int) -> list[list[dict]]:
+    """
+    Orders tables by estimated size (smallest first) and splits them into batches of `tables_per_job` tables.
+    """
+    ordered = sorted(table_mapping, key=lambda table: sizes.get(table["destination"], 0))
+    step = max(tables_per_job, 1)
+    return [ordered[i:i + step] for i in range(0, len(ordered), step)]
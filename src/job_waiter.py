@@ -0,0 +1,104 @@
+import logging
+import random
+import time
+from dataclasses import dataclass
+
+FINISHED_STATUSES = ("success", "error")
+# share of the expected duration slept before the first poll, jobs finishing earlier are seen that late
+FIRST_POLL_FRACTION = 0.8
+# poll interval around the expected finish, relative to the expected duration
+NEAR_FINISH_FRACTION = 0.02
+
+
+class JobWaitTimeout(Exception):
+    pass
+
+
+@dataclass
+class JobWaitResult:
+    job: dict
+    polls: int
+    waited_seconds: float
+
+
+class JobWaiter:
+    """
+    Polls storage job detail until the job finishes. Polling starts fast and backs off exponentially
+    (with jitter, so parallel runs do not poll in lockstep) up to the max interval.
+    Waiting fails after `timeout` seconds or at `deadline`, a time.monotonic() value shared by all jobs of a run.
+    When the job duration can be expected from previous jobs, the first poll is delayed until shortly before
+    the expected finish and polling starts from an interval proportional to it.
+    """
+
+    def __init__(
+        self,
+        client,
+        initial_interval: float = 0.5,
+        max_interval: float = 20.0,
+        backoff_factor: float = 1.5,
+        jitter: float = 0.2,
+        timeout: float | None = None,
+        deadline: float | None = None,
+    ):
+        self.client = client
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.jitter = jitter
+        self.timeout = timeout
+        self.deadline = deadline
+
+    def intervals(self, initial_interval: float | None = None):
+        interval = initial_interval or self.initial_interval
+        while True:
+            yield min(interval * random.uniform(1 - self.jitter, 1 + self.jitter), self.max_interval)
+            interval = min(interval * self.backoff_factor, self.max_interval)
+
+    def wait(self, job_id, budget: float | None = None, expected: float | None = None) -> JobWaitResult:
+        """
+        Waits for the job, warning once when it runs longer than the expected `budget` seconds.
+        `expected` is the predicted duration of the job in seconds, used only to schedule the polls.
+        """
+        started = time.monotonic()
+        polls = 0
+        intervals = self.intervals()
+        over_budget = False
+
+        if expected:
+            first_poll = expected * FIRST_POLL_FRACTION
+            if self.timeout is not None:
+                first_poll = min(first_poll, self.timeout)
+            if self.deadline is not None:
+                first_poll = min(first_poll, max(self.deadline - started, 0))
+            logging.debug(f"Job {job_id} is expected to take {expected:.1f} s, first poll in {first_poll:.1f} s")
+            time.sleep(first_poll)
+            intervals = self.intervals(max(self.initial_interval, expected * NEAR_FINISH_FRACTION))
+
+        while True:
+            job = self.client.jobs.detail(job_id)
+            polls += 1
+            waited = time.monotonic() - started
+            if budget and not over_budget and waited > budget:
+                logging.warning(f"Job {job_id} has been running for {waited:.0f} s, longer than expected {budget} s.")
+                over_budget = True
+            if job["status"] in FINISHED_STATUSES:
+                return JobWaitResult(job=job, polls=polls, waited_seconds=waited)
+
+            sleep_for = next(intervals)
+            if self.timeout is not None:
+                remaining = self.timeout - waited
+                if remaining <= 0:
+                    raise JobWaitTimeout(
+                        f"Job {job_id} did not finish within {self.timeout} s, last status: {job['status']}"
+                    )
+                sleep_for = min(sleep_for, remaining)
+            if self.deadline is not None:
+                remaining = self.deadline - started - waited
+                if remaining <= 0:
+                    raise JobWaitTimeout(
+                        f"Job {job_id} did not finish before the run deadline, last status: {job['status']}"
+                    )
+                sleep_for = min(sleep_for, remaining)
+
+            logging.debug(f"Job {job_id} is still running, status: {job['status']}, next poll in {sleep_for:.1f} s")
+            time.sleep(sleep_for)
@@ -0,0 +1,106 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from configuration import TableSpec
+
+# types which COPY loads as-is, so requesting them does not need type casting
+PASS_THROUGH_TYPES = {"VARCHAR", "TEXT", "STRING"}
+# below this size a full COPY is cheap enough and avoids drifting from the source
+INCREMENTAL_MIN_ROWS = 100_000
+
+
+@dataclass
+class LoadPlan:
+    load_type: str
+    incremental: bool
+    reason: str
+
+
+def requests_typed_columns(spec: TableSpec, table_detail: dict | None) -> bool:
+    """
+    True when the configuration renames, casts or selects a subset of columns, converts empty values to NULL
+    (nullable columns) or fills defaults, which CLONE cannot do.
+    """
+    if not spec.items:
+        return False
+    for item in spec.items:
+        if item.dbName != item.name or item.type.upper() not in PASS_THROUGH_TYPES or item.size:
+            return True
+        if item.nullable or item.default:
+            return True
+    source_columns = (table_detail or {}).get("columns")
+    return source_columns is None or {item.name for item in spec.items} != set(source_columns)
+
+
+def plan_load(
+    spec: TableSpec, table_detail: dict | None, has_history: bool, filtered: bool = False, preserve: bool = True
+) -> LoadPlan:
+    """
+    Picks the cheapest valid load type: zero-copy CLONE when no column changes or filters are requested,
+    otherwise an incremental COPY of a large table loaded before into a preserved workspace, otherwise a full COPY.
+    The table detail has to include the columns, otherwise CLONE is never picked for a configured column list.
+    """
+    detail = table_detail or {}
+    size = f"{detail.get('rowsCount', 'unknown')} rows, {detail.get('dataSizeBytes', 'unknown')} bytes"
+
+    if not filtered and not requests_typed_columns(spec, table_detail):
+        return LoadPlan("CLONE", False, f"no column changes requested, zero-copy clone of {size}")
+
+    if not spec.primary_key:
+        return LoadPlan("COPY", False, f"typed columns requested and no primary key to merge increments, {size}")
+    if not preserve:
+        return LoadPlan("COPY", False, f"typed columns requested and the workspace is not preserved, {size}")
+    if not has_history:
+        return LoadPlan("COPY", False, f"typed columns requested and no previous load to continue from, {size}")
+    if (detail.get("rowsCount") or 0) < INCREMENTAL_MIN_ROWS:
+        return LoadPlan("COPY", False, f"typed columns requested and the table is small, {size}")
+    return LoadPlan("COPY", True, f"typed columns requested, loading changes since the previous load of {size}")
+
+
+def plan_delta_load(
+    spec: TableSpec,
+    table_detail: dict | None,
+    loaded: dict,
+    has_history: bool,
+    max_changed_fraction: float,
+    full_reload_days: int,
+    now: datetime,
+) -> LoadPlan:
+    """
+    Decides whether a full load of a table with a primary key can be done as an incremental upsert, which would not
+    remove deleted rows. Tables are reloaded fully when the metadata shows deletes since the saved watermark: fewer
+    rows, a change outside of imports (lastChangeDate after lastImportDate) or a table recreated after the previous
+    full load. Otherwise the changed fraction is estimated from the row count growth.
+    Storage metadata does not tell overwrite imports from incremental ones, so rows dropped by an overwrite import
+    which keeps the row count stay in the workspace until the full reload after full_reload_days.
+    """
+    detail = table_detail or {}
+    rows = detail.get("rowsCount")
+    if not spec.primary_key:
+        return LoadPlan("COPY", False, "no primary key to upsert by")
+    if not has_history or rows is None or loaded.get("rows_count") is None or not loaded.get("full_load_at"):
+        return LoadPlan("COPY", False, "no previous full load to continue from")
+    if rows < loaded["rows_count"]:
+        return LoadPlan("COPY", False, f"rows were deleted since the previous load ({loaded['rows_count']} -> {rows})")
+
+    created, watermark = _timestamp(detail.get("created")), _timestamp(loaded.get("watermark"))
+    changed_at, imported_at = _timestamp(detail.get("lastChangeDate")), _timestamp(detail.get("lastImportDate"))
+    if created and created > _timestamp(loaded["full_load_at"]):
+        return LoadPlan("COPY", False, "the table was recreated since the previous full load")
+    if changed_at and watermark and changed_at > watermark and changed_at > (imported_at or 0):
+        return LoadPlan("COPY", False, "rows were changed outside of imports since the previous load")
+
+    full_load_age = now - datetime.fromisoformat(loaded["full_load_at"])
+    if full_load_age.days >= full_reload_days:
+        return LoadPlan("COPY", False, f"last full load is {full_load_age.days} days old")
+
+    changed = (rows - loaded["rows_count"]) / max(rows, 1)
+    if changed > max_changed_fraction:
+        return LoadPlan("COPY", False, f"{changed:.1%} of rows added since the previous load")
+    return LoadPlan("COPY", True, f"{changed:.1%} of rows added since the previous load, upserting by primary key")
+
+
+def _timestamp(value) -> float | None:
+    if isinstance(value, (int, float)):
+        return float(value)
+    return datetime.fromisoformat(value).timestamp() if value else None
@@ -0,0 +1,79 @@
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from job_scheduler import LoadJobResult
+
+
+class RunReport:
+    """
+    Collects phase timings, storage jobs and per-table results of one run into a machine-readable report.
+    Job phases (submit, queue, processing) are summed over all jobs, so with parallel jobs they may exceed wall time.
+    """
+
+    def __init__(self):
+        self.started_at = datetime.now(timezone.utc)
+        self.phases: dict[str, float] = {}
+        self.jobs: list[dict] = []
+        self.tables: list[dict] = []
+        self.api: dict = {}
+        self.status = "success"
+        self.error: str | None = None
+
+    @contextmanager
+    def phase(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(name, time.perf_counter() - started)
+
+    def add_phase(self, name: str, seconds: float | None):
+        if seconds is not None:
+            self.phases[name] = round(self.phases.get(name, 0.0) + seconds, 3)
+
+    def add_job_result(self, result: LoadJobResult):
+        self.add_phase("submit", result.submit_seconds)
+        self.add_phase("queue", result.queue_seconds)
+        self.add_phase("processing", result.processing_seconds)
+
+        job_id = result.job.get("id")
+        self.jobs.append(
+            {
+                "id": job_id,
+                "status": result.job.get("status", "error"),
+                "tables": result.tables,
+                "polls": result.polls,
+                "waited_seconds": round(result.waited_seconds, 3),
+                "submit_seconds": result.submit_seconds,
+                "queue_seconds": result.queue_seconds,
+                "processing_seconds": result.processing_seconds,
+                "error": result.error,
+            }
+        )
+        for table in result.tables:
+            self.tables.append({"destination": table, "job_id": job_id, "success": result.success})
+
+    def add_skipped(self, destination: str):
+        self.tables.append({"destination": destination, "job_id": None, "success": True, "skipped": True})
+
+    def fail(self, error: Exception):
+        self.status = "error"
+        self.error = str(error)
+
+    def to_dict(self) -> dict:
+        return {
+            "started_at": self.started_at.isoformat(),
+            "status": self.status,
+            "error": self.error,
+            "phases": self.phases,
+            "jobs": self.jobs,
+            "tables": self.tables,
+            "skipped_tables": sum(1 for table in self.tables if table.get("skipped")),
+            "api": self.api,
+        }
+
+    def write(self, path: str):
+        with open(path, "w") as report_file:
+            json.dump(self.to_dict(), report_file, indent=2)
@@ -0,0 +1,128 @@
+import logging
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+
+import requests
+from kbcstorage.base import Endpoint
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+DEFAULT_TIMEOUT = (10, 120)  # connect, read
+
+
+@dataclass
+class TransportStats:
+    requests: int = 0
+    retries: int = 0
+    connections: int = 0
+
+
+class CountingRetry(Retry):
+    """
+    Retry policy which counts retries into shared stats. Non-idempotent calls (load job submission)
+    are retried only on 429, where the API guarantees the request was not processed.
+    """
+
+    stats: TransportStats | None = None
+
+    def new(self, **kw):
+        retry = super().new(**kw)
+        retry.stats = self.stats
+        return retry
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if status_code == 429 and self.total:
+            return True
+        return super().is_retry(method, status_code, has_retry_after)
+
+    def increment(self, *args, **kwargs):
+        retry = super().increment(*args, **kwargs)
+        if self.stats is not None:
+            self.stats.retries += 1
+        return retry
+
+
+class StorageTransport:
+    """
+    Keep-alive session shared by all Storage API endpoints of the client, replacing the per-call
+    connections of kbcstorage. Implements the get/post/put/delete interface of kbcstorage RetryRequests.
+    """
+
+    def __init__(self, pool_size: int = 10, max_retries: int = 5, backoff_factor: float = 0.5):
+        self.stats = TransportStats()
+        retry = CountingRetry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=IDEMPOTENT_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        retry.stats = self.stats
+        self.adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount("https://", self.adapter)
+        self.session.mount("http://", self.adapter)
+        self.clock_offset: float | None = None
+
+    def attach(self, client):
+        """
+        Routes requests of all client endpoints through this transport.
+        """
+        for endpoint in vars(client).values():
+            if isinstance(endpoint, Endpoint):
+                endpoint.requests = self
+
+    def request(self, method, url, *args, **kwargs) -> requests.Response:
+        kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+        self.stats.requests += 1
+        response = self.session.request(method, url, *args, **kwargs)
+        self.record_server_time(response)
+        return response
+
+    def record_server_time(self, response: requests.Response):
+        """
+        Tracks the offset of the Storage API clock from the local one using the Date header. The header is
+        truncated to seconds and sent before the response travels back, so the estimate never runs ahead of the server.
+        """
+        try:
+            server_time = parsedate_to_datetime(response.headers["Date"]).timestamp()
+        except (KeyError, TypeError, ValueError):
+            return
+        offset = server_time - time.time()
+        # latency only lowers the estimate, so the highest sample is the most accurate one
+        self.clock_offset = offset if self.clock_offset is None else max(self.clock_offset, offset)
+
+    def server_time(self) -> int | None:
+        if self.clock_offset is None:
+            return None
+        return int(time.time() + self.clock_offset)
+
+    def get(self, url, *args, **kwargs):
+        return self.request("GET", url, *args, **kwargs)
+
+    def post(self, url, *args, **kwargs):
+        return self.request("POST", url, *args, **kwargs)
+
+    def put(self, url, *args, **kwargs):
+        return self.request("PUT", url, *args, **kwargs)
+
+    def delete(self, url, *args, **kwargs):
+        return self.request("DELETE", url, *args, **kwargs)
+
+    def get_stats(self) -> TransportStats:
+        pools = self.adapter.poolmanager.pools
+        self.stats.connections = sum(pools[key].num_connections for key in pools.keys())
+        return self.stats
+
+    def log_stats(self):
+        stats = self.get_stats()
+        logging.info(
+            f"Storage API: {stats.requests} requests over {stats.connections} connections, {stats.retries} retries."
+        )
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,73 @@
+import time
+
+FINISHED_STATUSES = ("completed", "failed", "canceled")
+
+
+class WorkspaceQueryError(Exception):
+    pass
+
+
+class WorkspaceQuery:
+    """
+    Runs read-only SQL in a workspace through Keboola Query Service, which lives next to Storage API on the
+    query. subdomain of the stack and takes the same token. Storage API itself cannot list the tables of a workspace.
+    """
+
+    def __init__(
+        self,
+        transport,
+        storage_url: str,
+        token: str,
+        timeout: float = 60.0,
+        initial_interval: float = 0.2,
+        max_interval: float = 2.0,
+    ):
+        self.transport = transport
+        self.base_url = storage_url.rstrip("/").replace("://connection.", "://query.", 1) + "/api/v1"
+        self.headers = {"X-StorageAPI-Token": token}
+        self.timeout = timeout
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+
+    def execute(self, branch_id: str, workspace_id, statement: str) -> list[list]:
+        """
+        Rows returned by the statement, each a list of column values.
+        """
+        submitted = self.request(
+            "POST",
+            f"/branches/{branch_id}/workspaces/{workspace_id}/queries",
+            json={"statements": [statement], "transactional": False},
+        )
+        job = self.wait(submitted["queryJobId"])
+        result = job["statements"][0]
+        if job["status"] != "completed":
+            raise WorkspaceQueryError(f"Workspace query {job['status']}: {result.get('error') or job.get('error')}")
+        return self.request("GET", f"/queries/{job['queryJobId']}/{result['id']}/results").get("data") or []
+
+    def wait(self, query_job_id: str) -> dict:
+        started = time.monotonic()
+        interval = self.initial_interval
+        while True:
+            job = self.request("GET", f"/queries/{query_job_id}")
+            if job["status"] in FINISHED_STATUSES:
+                return job
+            if time.monotonic() - started > self.timeout:
+                raise WorkspaceQueryError(f"Workspace query {query_job_id} did not finish in {self.timeout:.0f} s")
+            time.sleep(interval)
+            interval = min(interval * 2, self.max_interval)
+
+    def request(self, method: str, path: str, **kwargs) -> dict:
+        response = self.transport.request(method, self.base_url + path, headers=self.headers, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+
+def list_tables_statement(connection: dict) -> str:
+    """
+    Query listing the tables of the workspace schema described by the connection of a workspace detail.
+    """
+    schema = connection["schema"]
+    if connection.get("backend") == "bigquery":
+        return f"SELECT table_name FROM `{schema}`.INFORMATION_SCHEMA.TABLES"
+    quoted = schema.replace("'", "''")
+    return f"SELECT TABLE_NAME FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = '{quoted}'"
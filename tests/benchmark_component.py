@@ -0,0 +1,154 @@
+"""
+End-to-end latency benchmark of the component against the fake Storage API.
+
+Runs `Component.run` and the `clean_workspace` sync action for workloads of 1/10/100 tables with 10/1000 columns
+and reports wall time, Storage API call counts and peak Python memory.
+
+Usage (from the repository root):
+    python -m tests.benchmark_component [--queue-delay 0.2] [--processing-delay 0.5] [--output bench.json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from unittest import mock
+
+from component import Component
+from tests.fake_storage_api import FakeStorageApi, FakeStorageSettings
+
+TABLE_COUNTS = (1, 10, 100)
+COLUMN_COUNTS = (10, 1000)
+
+
+def make_data_dir(root: str, tables: int, columns: int, action: str = "run", **parameters) -> str:
+    """
+    Creates a data folder with a multi-table configuration of the given size.
+    """
+    data_dir = Path(root) / f"{tables}x{columns}-{action}"
+    (data_dir / "in").mkdir(parents=True, exist_ok=True)
+    (data_dir / "out" / "files").mkdir(parents=True, exist_ok=True)
+
+    items = [
+        {"name": f"col_{c}", "dbName": f"col_{c}", "type": "VARCHAR", "nullable": True, "size": "255"}
+        for c in range(columns)
+    ]
+    config = {
+        "action": action,
+        "parameters": {
+            "db": {"workspaceId": 12345},
+            "tables": [
+                {"tableId": f"in.c-bench.table_{t}", "dbName": f"table_{t}", "primaryKey": ["col_0"], "items": items}
+                for t in range(tables)
+            ],
+            **parameters,
+        },
+        "storage": {
+            "input": {
+                "tables": [
+                    {"source": f"in.c-bench.table_{t}", "destination": f"table_{t}.csv"} for t in range(tables)
+                ]
+            }
+        },
+    }
+    with open(data_dir / "config.json", "w") as config_file:
+        json.dump(config, config_file)
+    return str(data_dir)
+
+
+def make_table_details(tables: int, columns: int) -> dict[str, dict]:
+    """
+    Storage table details with typed column metadata matching the tables of make_data_dir.
+    """
+    names = [f"col_{c}" for c in range(columns)]
+    metadata = [{"key": "KBC.datatype.basetype", "value": "STRING"}, {"key": "KBC.datatype.nullable", "value": "1"}]
+    return {
+        f"in.c-bench.table_{t}": {
+            "id": f"in.c-bench.table_{t}",
+            "rowsCount": 1000,
+            "dataSizeBytes": 100_000,
+            "columns": names,
+            "columnMetadata": {name: metadata for name in names},
+        }
+        for t in range(tables)
+    }
+
+
+def measure(api: FakeStorageApi, data_dir: str, action: str) -> dict:
+    env = {
+        "KBC_DATADIR": data_dir,
+        "KBC_URL": api.url,
+        "KBC_TOKEN": "benchmark-token",
+        "KBC_BRANCHID": "default",
+        "KBC_CONFIGID": "12345",
+    }
+    api.reset_counters()
+    tracemalloc.start()
+    started = time.perf_counter()
+    with mock.patch.dict(os.environ, env):
+        comp = Component()
+        if action == "run":
+            comp.run()
+        else:
+            comp.clean_workspace()
+    wall = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "action": action,
+        "wall_seconds": round(wall, 3),
+        "api_calls": sum(count for name, count in api.calls.items() if name not in ("rate_limited", "injected_errors")),
+        "api_calls_by_endpoint": dict(api.calls),
+        "connections": api.connections,
+        "peak_memory_mb": round(peak / 1024 / 1024, 2),
+    }
+
+
+def run_benchmarks(settings: FakeStorageSettings, table_counts=TABLE_COUNTS, column_counts=COLUMN_COUNTS) -> list[dict]:
+    results = []
+    with FakeStorageApi(settings) as api, tempfile.TemporaryDirectory() as root:
+        for tables in table_counts:
+            for columns in column_counts:
+                data_dir = make_data_dir(root, tables, columns)
+                for action in ("run", "clean_workspace"):
+                    results.append({"tables": tables, "columns": columns, **measure(api, data_dir, action)})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queue-delay", type=float, default=0.2)
+    parser.add_argument("--processing-delay", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit", type=int, default=None)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    settings = FakeStorageSettings(
+        queue_delay=args.queue_delay,
+        processing_delay=args.processing_delay,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+    )
+    results = run_benchmarks(settings)
+
+    print(f"{'tables':>6} {'columns':>7} {'action':<16} {'wall s':>8} {'calls':>6} {'conns':>6} {'peak MB':>8}")
+    for r in results:
+        print(
+            f"{r['tables']:>6} {r['columns']:>7} {r['action']:<16} {r['wall_seconds']:>8.3f} "
+            f"{r['api_calls']:>6} {r['connections']:>6} {r['peak_memory_mb']:>8.2f}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark of configuration parsing and table mapping build for wide tables.
+
+Builds the load payload of one table with 10 to 10000 columns without talking to Storage API and reports the time
+spent validating the parameters, building the mapping and the peak Python memory, showing how the cost grows with
+the column count.
+
+Usage (from the repository root):
+    python -m tests.benchmark_mapping [--repeat 5] [--output mapping.json]
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from unittest import mock
+
+from component import Component
+from tests.benchmark_component import make_data_dir
+
+COLUMN_COUNTS = (10, 100, 1000, 10000)
+
+
+def measure(data_dir: str) -> dict:
+    with mock.patch.dict(os.environ, {"KBC_DATADIR": data_dir}):
+        comp = Component()
+        started = time.perf_counter()
+        comp.params  # validated on first access
+        parsed = time.perf_counter()
+        comp.storage_input = comp.load_storage_input()
+        comp.build_table_mapping()
+        built = time.perf_counter()
+    return {"parse_seconds": parsed - started, "build_seconds": built - parsed}
+
+
+def run_benchmarks(column_counts=COLUMN_COUNTS, repeat: int = 5) -> list[dict]:
+    results = []
+    with tempfile.TemporaryDirectory() as root:
+        for columns in column_counts:
+            data_dir = make_data_dir(root, tables=1, columns=columns)
+            runs = [measure(data_dir) for _ in range(repeat)]
+
+            tracemalloc.start()
+            measure(data_dir)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            parse = statistics.median(run["parse_seconds"] for run in runs)
+            build = statistics.median(run["build_seconds"] for run in runs)
+            results.append(
+                {
+                    "columns": columns,
+                    "parse_seconds": round(parse, 4),
+                    "build_seconds": round(build, 4),
+                    "us_per_column": round((parse + build) / columns * 1e6, 2),
+                    "peak_memory_mb": round(peak / 1024 / 1024, 2),
+                }
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    results = run_benchmarks(repeat=args.repeat)
+
+    print(f"{'columns':>7} {'parse s':>8} {'build s':>8} {'us/column':>10} {'peak MB':>8}")
+    for r in results:
+        print(
+            f"{r['columns']:>7} {r['parse_seconds']:>8.4f} {r['build_seconds']:>8.4f} "
+            f"{r['us_per_column']:>10.2f} {r['peak_memory_mb']:>8.2f}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Startup latency benchmark of the component actions against the fake Storage API.
+
+For every action it measures, in fresh interpreters, the time to import `component` and the time from process start
+to the first Storage API request, which is what users wait for before a sync action shows any progress in the UI.
+
+Usage (from the repository root):
+    python -m tests.benchmark_startup [--repeat 5] [--tables 10] [--columns 100] [--output startup.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from tests.benchmark_component import make_data_dir, make_table_details
+from tests.fake_storage_api import FakeStorageApi, FakeStorageSettings
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+ACTIONS = ("run", "clean_workspace", "plan", "job_status", "derive_column_types", "list_stale_tables")
+IMPORT_SCRIPT = "import time; started = time.perf_counter(); import component; print(time.perf_counter() - started)"
+
+
+def measure_import(env: dict) -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT], env=env, cwd=SRC_DIR, check=True, capture_output=True, text=True
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def measure_first_request(api: FakeStorageApi, env: dict) -> tuple[float, float]:
+    """
+    Runs the component entrypoint and returns seconds to the first Storage API request and to the process exit.
+    """
+    api.reset_counters()
+    started = time.time()
+    subprocess.run([sys.executable, str(SRC_DIR / "component.py")], env=env, capture_output=True, check=True)
+    finished = time.time()
+    if api.first_request_at is None:
+        raise RuntimeError("The action did not call Storage API")
+    return api.first_request_at - started, finished - started
+
+
+def run_benchmarks(tables: int, columns: int, repeat: int) -> list[dict]:
+    results = []
+    settings = FakeStorageSettings(tables=make_table_details(tables, columns))
+    with FakeStorageApi(settings) as api, tempfile.TemporaryDirectory() as root:
+        for action in ACTIONS:
+            env = {
+                **os.environ,
+                "PYTHONPATH": str(SRC_DIR),
+                "KBC_DATADIR": make_data_dir(root, tables, columns, action=action),
+                "KBC_URL": api.url,
+                "KBC_TOKEN": "benchmark-token",
+                "KBC_BRANCHID": "default",
+                "KBC_CONFIGID": "12345",
+            }
+            imports = [measure_import(env) for _ in range(repeat)]
+            first_requests, totals = zip(*(measure_first_request(api, env) for _ in range(repeat)))
+            results.append(
+                {
+                    "action": action,
+                    "import_seconds": round(statistics.median(imports), 3),
+                    "first_request_seconds": round(statistics.median(first_requests), 3),
+                    "total_seconds": round(statistics.median(totals), 3),
+                }
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--tables", type=int, default=10)
+    parser.add_argument("--columns", type=int, default=100)
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.tables, args.columns, args.repeat)
+
+    print(f"{'action':<20} {'import s':>9} {'first request s':>16} {'total s':>8}")
+    for r in results:
+        print(
+            f"{r['action']:<20} {r['import_seconds']:>9.3f} {r['first_request_seconds']:>16.3f} "
+            f"{r['total_seconds']:>8.3f}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
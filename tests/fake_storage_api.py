@@ -0,0 +1,232 @@
+"""
+In-process stand-in for the parts of Keboola Storage API used by the component.
+
+Jobs move from "waiting" to "processing" to "success" according to the configured queue and processing delays.
+Transient errors (503), rate limiting (429 with Retry-After) and failing jobs can be injected.
+Workspace queries of Query Service return the tables loaded to the workspace.
+"""
+
+import json
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+@dataclass
+class FakeStorageSettings:
+    queue_delay: float = 0.0
+    processing_delay: float = 0.0
+    error_rate: float = 0.0  # share of requests answered with 503
+    rate_limit: int | None = None  # max requests per second before answering 429
+    failing_tables: set[str] = field(default_factory=set)  # jobs loading these destinations end with error
+    workspaces: list[int] = field(default_factory=lambda: [12345])
+    tables: dict[str, dict] = field(default_factory=dict)  # table id -> table detail
+
+
+def _iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+
+class FakeStorageApi:
+    def __init__(self, settings: FakeStorageSettings | None = None):
+        self.settings = settings or FakeStorageSettings()
+        self.calls = Counter()
+        self.connections = 0
+        self.jobs: dict[str, dict] = {}
+        self.config_state: dict = {}
+        self.workspace_tables: set[str] = set()
+        self.queries: dict[str, list[list]] = {}
+        self.first_request_at: float | None = None  # wall clock time of the first request since the last reset
+        self.lock = threading.Lock()
+        self._request_times: list[float] = []
+        self._requests_total = 0
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_counters(self):
+        with self.lock:
+            self.calls.clear()
+            self.connections = 0
+            self.first_request_at = None
+
+    def _handler_class(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with api.lock:
+                    api.connections += 1
+
+            def do_GET(self):
+                api.handle(self, "GET")
+
+            def do_POST(self):
+                api.handle(self, "POST")
+
+            def do_PUT(self):
+                api.handle(self, "PUT")
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def handle(self, request: BaseHTTPRequestHandler, method: str):
+        length = int(request.headers.get("Content-Length", 0))
+        body = json.loads(request.rfile.read(length) or b"null") if length else None
+        path = request.path.split("?")[0]
+
+        injected = self._injected_error()
+        if injected:
+            status, headers = injected
+            return self._respond(request, status, {"error": "injected"}, headers)
+
+        for route_method, pattern, route in self._routes():
+            match = re.fullmatch(pattern, path)
+            if match and route_method == method:
+                with self.lock:
+                    self.calls[route.__name__] += 1
+                status, payload = route(body, *match.groups())
+                return self._respond(request, status, payload)
+
+        self._respond(request, 404, {"error": f"Unknown endpoint {method} {path}"})
+
+    def _injected_error(self):
+        with self.lock:
+            now = time.monotonic()
+            self.first_request_at = self.first_request_at or time.time()
+            self._requests_total += 1
+            if self.settings.rate_limit:
+                self._request_times = [t for t in self._request_times if now - t < 1] + [now]
+                if len(self._request_times) > self.settings.rate_limit:
+                    self.calls["rate_limited"] += 1
+                    return 429, {"Retry-After": "1"}
+            if self.settings.error_rate and self._requests_total % round(1 / self.settings.error_rate) == 0:
+                self.calls["injected_errors"] += 1
+                return 503, {}
+        return None
+
+    @staticmethod
+    def _respond(request, status: int, payload, headers: dict | None = None):
+        data = json.dumps(payload).encode()
+        request.send_response(status)
+        for key, value in (headers or {}).items():
+            request.send_header(key, value)
+        request.send_header("Content-Type", "application/json")
+        request.send_header("Content-Length", str(len(data)))
+        request.end_headers()
+        request.wfile.write(data)
+
+    def _routes(self):
+        return [
+            ("POST", r"/v2/storage/workspaces/(\d+)/load(?:-clone)?", self.load_tables),
+            ("GET", r"/v2/storage/jobs/([^/]+)", self.job_detail),
+            ("GET", r"/v2/storage/branch/[^/]+/components/[^/]+/configs/[^/]+/workspaces", self.config_workspaces),
+            ("GET", r"/v2/storage/branch/[^/]+/components/[^/]+/configs/[^/]+(?:/rows/[^/]+)?", self.config_detail),
+            ("PUT", r"/v2/storage/branch/[^/]+/components/[^/]+/configs/[^/]+(?:/rows/[^/]+)?/state", self.put_state),
+            ("GET", r"/v2/storage/tokens/verify", self.verify_token),
+            ("GET", r"/v2/storage/tables", self.tables_list),
+            ("GET", r"/v2/storage/tables/([^/]+)", self.table_detail),
+            ("GET", r"/v2/storage/workspaces/(\d+)", self.workspace_detail),
+            ("GET", r"/v2/storage/dev-branches", self.branches_list),
+            ("POST", r"/api/v1/branches/[^/]+/workspaces/(\d+)/queries", self.submit_query),
+            ("GET", r"/api/v1/queries/([^/]+)", self.query_detail),
+            ("GET", r"/api/v1/queries/([^/]+)/[^/]+/results", self.query_results),
+        ]
+
+    def load_tables(self, body, workspace_id):
+        if int(workspace_id) not in self.settings.workspaces:
+            return 404, {"error": f"Workspace {workspace_id} not found"}
+        destinations = {table["destination"] for table in body.get("input", [])}
+        with self.lock:
+            self.workspace_tables |= destinations
+            job_id = str(len(self.jobs) + 1)
+            self.jobs[job_id] = {
+                "created": time.time(),
+                "failed": bool(destinations & self.settings.failing_tables),
+                "tables": len(destinations),
+            }
+        return 202, {"id": job_id, "status": "waiting"}
+
+    def job_detail(self, body, job_id):
+        job = self.jobs.get(job_id)
+        if not job:
+            return 404, {"error": f"Job {job_id} not found"}
+
+        started = job["created"] + self.settings.queue_delay
+        ended = started + self.settings.processing_delay
+        now = time.time()
+        detail = {"id": job_id, "createdTime": _iso(job["created"])}
+        if now < started:
+            return 200, {**detail, "status": "waiting"}
+        if now < ended:
+            return 200, {**detail, "status": "processing", "startTime": _iso(started)}
+
+        detail.update({"startTime": _iso(started), "endTime": _iso(ended)})
+        if job["failed"]:
+            return 200, {**detail, "status": "error", "error": {"message": "Injected job failure"}}
+        return 200, {**detail, "status": "success"}
+
+    def config_workspaces(self, body):
+        return 200, [{"id": workspace_id} for workspace_id in self.settings.workspaces]
+
+    def config_detail(self, body):
+        return 200, {"id": "12345", "state": self.config_state}
+
+    def put_state(self, body):
+        self.config_state = json.loads(body["state"])
+        return 200, {"id": "12345", "state": self.config_state}
+
+    def verify_token(self, body):
+        return 200, {"id": "1", "description": "fake token"}
+
+    def tables_list(self, body):
+        return 200, list(self.settings.tables.values())
+
+    def table_detail(self, body, table_id):
+        if table_id not in self.settings.tables:
+            return 404, {"error": f"Table {table_id} not found"}
+        return 200, self.settings.tables[table_id]
+
+    def workspace_detail(self, body, workspace_id):
+        if int(workspace_id) not in self.settings.workspaces:
+            return 404, {"error": f"Workspace {workspace_id} not found"}
+        connection = {"backend": "snowflake", "schema": f"WORKSPACE_{workspace_id}"}
+        return 200, {"id": int(workspace_id), "connection": connection}
+
+    def branches_list(self, body):
+        return 200, [{"id": 1, "name": "Main", "isDefault": True}]
+
+    def submit_query(self, body, workspace_id):
+        # only the table listing of the workspace schema is understood, it finishes immediately
+        with self.lock:
+            query_job_id = str(len(self.queries) + 1)
+            self.queries[query_job_id] = [[table] for table in sorted(self.workspace_tables)]
+        return 201, {"queryJobId": query_job_id}
+
+    def query_detail(self, body, query_job_id):
+        if query_job_id not in self.queries:
+            return 404, {"error": f"Query job {query_job_id} not found"}
+        return 200, {"queryJobId": query_job_id, "status": "completed", "statements": [{"id": "1"}]}
+
+    def query_results(self, body, query_job_id):
+        return 200, {"columns": [{"name": "TABLE_NAME"}], "data": self.queries.get(query_job_id, [])}
@@ -0,0 +1,50 @@
+import unittest
+
+from column_types import derive_columns
+
+
+def metadata(**values):
+    return [{"key": f"KBC.datatype.{key}", "value": value, "provider": "keboola.ex-db-snowflake"} for key, value in values.items()]
+
+
+class TestColumnTypes(unittest.TestCase):
+    def test_native_definition_of_typed_table(self):
+        """Test typed tables use their native column definition"""
+        table = {
+            "columns": ["id", "amount"],
+            "definition": {
+                "columns": [
+                    {"name": "id", "definition": {"type": "NUMBER", "nullable": False, "length": "38,0"}},
+                    {"name": "amount", "definition": {"type": "FLOAT", "nullable": True}},
+                ]
+            },
+        }
+
+        columns = derive_columns(table)
+
+        self.assertEqual([(c.name, c.type, c.size, c.nullable) for c in columns], [
+            ("id", "NUMBER", "38,0", False),
+            ("amount", "FLOAT", "", True),
+        ])
+
+    def test_column_metadata(self):
+        """Test base types from column metadata map to workspace types and missing metadata falls back to VARCHAR"""
+        table = {
+            "columns": ["id", "created", "note"],
+            "columnMetadata": {
+                "id": metadata(basetype="NUMERIC", length="10,2", nullable="0"),
+                "created": metadata(basetype="TIMESTAMP", length="9", nullable="1"),
+            },
+        }
+
+        columns = derive_columns(table)
+
+        self.assertEqual([(c.name, c.dbName, c.type, c.size, c.nullable) for c in columns], [
+            ("id", "id", "NUMBER", "10,2", False),
+            ("created", "created", "TIMESTAMP_NTZ", "", True),
+            ("note", "note", "VARCHAR", "", True),
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,8 +3,14 @@ import mock
 import os
 import json
 from freezegun import freeze_time
+from keboola.component.exceptions import UserException
+from keboola.component.sync_actions import MessageType
+from requests import HTTPError
 
-from component import Component, parse_last_run_to_timestamp
+from component import Component, fingerprint, parse_last_run_to_timestamp
+from configuration import ColumnSpec
+from load_tables_dataclass import Column, Table
+from workspace_query import WorkspaceQueryError
 
 
 class TestComponent(unittest.TestCase):
@@ -35,6 +41,34 @@ class TestComponent(unittest.TestCase):
         result = parse_last_run_to_timestamp("2026-01-07T13:30:06+00:00")
         self.assertEqual(result, 1767792606)
 
+    def test_column_mapping_matches_model(self):
+        """Test the directly built column payload and fingerprint equal those of the pydantic models"""
+        specs = [
+            ColumnSpec(name="id", dbName="ID", type="NUMBER", nullable=False, size="38,0"),
+            ColumnSpec(name="name", dbName="NAME", type="VARCHAR", nullable=True),
+        ]
+        columns = [Component.column_mapping(spec) for spec in specs]
+        models = [
+            Column(
+                source=spec.name,
+                destination=spec.dbName,
+                type=spec.type,
+                length=spec.size,
+                nullable=spec.nullable,
+                convert_empty_values_to_null=spec.nullable,
+            )
+            for spec in specs
+        ]
+        self.assertEqual(columns, [model.model_dump(by_alias=True) for model in models])
+
+        # fingerprints stored in the state by earlier versions stay valid
+        tbl = Table(source="in.c-main.users", destination="users", columns=models)
+        exclude = {"changed_since", "changed_until", "incremental", "overwrite"}
+        self.assertEqual(
+            Component.table_fingerprint(tbl.model_copy(update={"columns": []}), columns),
+            fingerprint(tbl.model_dump(by_alias=True, exclude=exclude)),
+        )
+
     # set global time to 2010-10-10 - affects functions like datetime.now()
     @freeze_time("2010-10-10")
     # set KBC_DATADIR env to non-existing dir
@@ -47,7 +81,7 @@ class TestComponent(unittest.TestCase):
     # FULL LOAD TESTS
 
     @freeze_time("2024-01-15 10:00:00")
-    @mock.patch("component.Client")
+    @mock.patch("kbcstorage.client.Client")
     @mock.patch.dict(
         os.environ,
         {
@@ -102,7 +136,7 @@ class TestComponent(unittest.TestCase):
         )
 
     @freeze_time("2024-01-15 10:00:00")
-    @mock.patch("component.Client")
+    @mock.patch("kbcstorage.client.Client")
     @mock.patch.dict(
         os.environ,
         {
@@ -149,7 +183,7 @@ class TestComponent(unittest.TestCase):
         self.comparedict(price_col, {"type": "FLOAT", "nullable": True}, "Price column")
 
     @freeze_time("2024-01-15 10:00:00")
-    @mock.patch("component.Client")
+    @mock.patch("kbcstorage.client.Client")
     @mock.patch.dict(
         os.environ,
         {
@@ -188,7 +222,7 @@ class TestComponent(unittest.TestCase):
                 json.dump(config, f)
 
     @freeze_time("2024-01-15 10:00:00")
-    @mock.patch("component.Client")
+    @mock.patch("kbcstorage.client.Client")
     @mock.patch.dict(
         os.environ,
         {
@@ -226,7 +260,7 @@ class TestComponent(unittest.TestCase):
     # INCREMENTAL LOAD TESTS
 
     @freeze_time("2024-01-15 10:00:00")
-    @mock.patch("component.Client")
+    @mock.patch("kbcstorage.client.Client")
     @mock.patch.dict(
         os.environ,
         {
@@ -278,7 +312,7 @@ class TestComponent(unittest.TestCase):
         self.comparedict(event_col, {"type": "TEXT"}, "Event name column")
 
     @freeze_time("2024-01-15 10:00:00")
-    @mock.patch("component.Client")
+    @mock.patch("kbcstorage.client.Client")
     @mock.patch.dict(
         os.environ,
         {
@@ -323,7 +357,7 @@ class TestComponent(unittest.TestCase):
         self.assertEqual(mapping["changedUntil"], 1705312800)
 
     @freeze_time("2024-01-15 10:00:00")
-    @mock.patch("component.Client")
+    @mock.patch("kbcstorage.client.Client")
     @mock.patch.dict(
         os.environ,
         {
@@ -367,7 +401,7 @@ class TestComponent(unittest.TestCase):
         )
 
     @freeze_time("2024-01-15 10:00:00")
-    @mock.patch("component.Client")
+    @mock.patch("kbcstorage.client.Client")
     @mock.patch.dict(
         os.environ,
         {
@@ -406,21 +440,19 @@ class TestComponent(unittest.TestCase):
         # Frozen time 2024-01-15 10:00:00 as ISO format
         self.comparedict(state, {"last_run": "2024-01-15T10:00:00+00:00"}, "State file")
 
-    # CLONE MODE TESTS
-
     @freeze_time("2024-01-15 10:00:00")
-    @mock.patch("component.Client")
+    @mock.patch("kbcstorage.client.Client")
     @mock.patch.dict(
         os.environ,
         {
-            "KBC_DATADIR": "./tests/data/clone_mode",
+            "KBC_DATADIR": "./tests/data/incremental_adaptive",
             "KBC_STACKID": "connection.keboola.com",
             "KBC_TOKEN": "test-token",
             "KBC_CONFIGID": "12345",
         },
     )
-    def test_clone_mode_basic(self, mock_client):
-        """Test clone mode sets load_type to CLONE and dropTimestampColumn"""
+    def test_incremental_per_table_watermark(self, mock_client):
+        """Test watermarks are stored per table and a changed mapping triggers a full reload"""
         # Configure mock
         mock_client_instance = mock_client.return_value
         mock_client_instance.workspaces.load_tables.return_value = {"id": "12345"}
@@ -432,80 +464,219 @@ class TestComponent(unittest.TestCase):
             "endTime": "2024-01-15T10:00:05+00:00",
         }
 
-        # Run component
         comp = Component()
         comp.run()
+        events_state = dict(comp.state["tables"]["events_table"])
+        self.comparedict(
+            events_state,
+            {"source": "in.c-main.events", "watermark": "2024-01-15T10:00:00+00:00"},
+            "Table state",
+        )
 
-        # Assert load_tables call
-        call_args = mock_client_instance.workspaces.load_tables.call_args
-        table_mapping = call_args[1]["table_mapping"]
-        mapping = table_mapping[0]
+        # Per-table watermark takes precedence over the legacy last_run
+        comp = Component()
+        comp.state = {"last_run": 1, "tables": {"events_table": {**events_state, "watermark": 1705311000}}}
+        comp.run()
+        mapping = mock_client_instance.workspaces.load_tables.call_args[1]["table_mapping"][0]
+        self.comparedict(mapping, {"incremental": True, "changedSince": 1705311000}, "Watermark")
 
-        # Check CLONE mode settings
-        self.comparedict(mapping, {"loadType": "CLONE", "dropTimestampColumn": True}, "Clone mode settings")
+        # Changed column set leads to a full reload
+        comp = Component()
+        comp.state = {"tables": {"events_table": dict(events_state)}}
+        comp.params.items.pop()
+        comp.run()
+        mapping = mock_client_instance.workspaces.load_tables.call_args[1]["table_mapping"][0]
+        self.comparedict(mapping, {"incremental": False, "overwrite": True, "changedSince": None}, "Full reload")
+        self.assertNotEqual(comp.state["tables"]["events_table"]["mapping"], events_state["mapping"])
 
-        # In clone mode, changedSince and changedUntil are None (no time filtering)
-        self.assertIsNone(mapping.get("changedSince"))
-        self.assertIsNone(mapping.get("changedUntil"))
+    @freeze_time("2024-01-15 10:00:00")
+    @mock.patch("kbcstorage.client.Client")
+    @mock.patch.dict(
+        os.environ,
+        {
+            "KBC_DATADIR": "./tests/data/multi_table",
+            "KBC_STACKID": "connection.keboola.com",
+            "KBC_TOKEN": "test-token",
+            "KBC_CONFIGID": "12345",
+        },
+    )
+    def test_incremental_new_table_starts_from_beginning(self, mock_client):
+        """Test a table without its own watermark is read from the beginning once others have watermarks"""
+        # Configure mock
+        mock_client_instance = mock_client.return_value
+        mock_client_instance.workspaces.load_tables.return_value = {"id": "12345"}
+        mock_client_instance.jobs.detail.return_value = {
+            "status": "success",
+            "id": "12345",
+            "createdTime": "2024-01-15T10:00:00+00:00",
+            "startTime": "2024-01-15T10:00:01+00:00",
+            "endTime": "2024-01-15T10:00:05+00:00",
+        }
+
+        comp = Component()
+        comp.state = {"last_run": 1705309200, "tables": {"users_table": {"watermark": 1705309200}}}
+        comp.run()
+
+        events = mock_client_instance.workspaces.load_tables.call_args[1]["table_mapping"][2]
+        self.comparedict(events, {"incremental": True, "changedSince": 1}, "New incremental table")
 
     @freeze_time("2024-01-15 10:00:00")
-    @mock.patch("component.Client")
+    @mock.patch("kbcstorage.client.Client")
     @mock.patch.dict(
         os.environ,
         {
-            "KBC_DATADIR": "./tests/data/clone_mode",
+            "KBC_DATADIR": "./tests/data/incremental_adaptive",
             "KBC_STACKID": "connection.keboola.com",
             "KBC_TOKEN": "test-token",
             "KBC_CONFIGID": "12345",
         },
     )
-    def test_clone_mode_removes_incompatible_fields(self, mock_client):
-        """Test clone mode uses CLONE loadType and doesn't have seconds field"""
+    def test_incremental_window_uses_storage_time(self, mock_client):
+        """Test the window ends at Storage API time and exactly that bound is saved as the watermark"""
         # Configure mock
         mock_client_instance = mock_client.return_value
         mock_client_instance.workspaces.load_tables.return_value = {"id": "12345"}
         mock_client_instance.jobs.detail.return_value = {
+            "status": "success",
+            "id": "12345",
+            "createdTime": "2024-01-15T09:59:51+00:00",
+            "startTime": "2024-01-15T10:00:01+00:00",
+            "endTime": "2024-01-15T10:00:05+00:00",
+        }
+
+        comp = Component()
+        # Storage clock is 10 s behind the container clock
+        comp.transport.server_time = mock.Mock(return_value=1705312790)
+        comp.run()
+
+        mapping = mock_client_instance.workspaces.load_tables.call_args[1]["table_mapping"][0]
+        self.comparedict(mapping, {"changedSince": 1705309200, "changedUntil": 1705312790}, "Window")
+        self.assertEqual(comp.state["tables"]["events_table"]["watermark"], "2024-01-15T09:59:50+00:00")
+
+    @freeze_time("2024-01-15 10:00:00")
+    @mock.patch("kbcstorage.client.Client")
+    @mock.patch.dict(
+        os.environ,
+        {
+            "KBC_DATADIR": "./tests/data/incremental_adaptive",
+            "KBC_STACKID": "connection.keboola.com",
+            "KBC_TOKEN": "test-token",
+            "KBC_CONFIGID": "12345",
+        },
+    )
+    def test_incremental_sliced_backfill(self, mock_client):
+        """Test a long window loads in slices and a failed slice keeps the watermark of the previous one"""
+        # Configure mock
+        mock_client_instance = mock_client.return_value
+        mock_client_instance.workspaces.load_tables.return_value = {"id": "12345"}
+        mock_client_instance.configurations.base_url = "https://connection.keboola.com/v2/storage/components"
+        mock_client_instance.configurations._get.return_value = {"state": {"storage": {}}}
+        job = {
             "status": "success",
             "id": "12345",
             "createdTime": "2024-01-15T10:00:00+00:00",
             "startTime": "2024-01-15T10:00:01+00:00",
             "endTime": "2024-01-15T10:00:05+00:00",
         }
+        failed_job = {**job, "status": "error", "error": {"message": "Slice failed"}}
+        mock_client_instance.jobs.detail.side_effect = [job, failed_job]
+        mock_client_instance.tables.list.return_value = [
+            {"id": "in.c-main.events", "lastImportDate": "2024-01-15T08:00:00+0100", "lastChangeDate": "2024-01-15"}
+        ]
 
-        # Run component
         comp = Component()
+        comp.params.incremental_slice_seconds = 3600
+        comp.params.skip_unchanged_tables = True
+        comp.transport.server_time = mock.Mock(return_value=1705312800)
+        comp.state = {"tables": {"events_table": {"watermark": 1705305600}}}
+        with self.assertRaises(UserException):
+            comp.run()
+
+        windows = [
+            (call[1]["table_mapping"][0]["changedSince"], call[1]["table_mapping"][0]["changedUntil"])
+            for call in mock_client_instance.workspaces.load_tables.call_args_list
+        ]
+        self.assertEqual(windows, [(1705305600, 1705309200), (1705309200, 1705312800)])
+        self.assertEqual(comp.state["tables"]["events_table"]["watermark"], "2024-01-15T09:00:00+00:00")
+
+        put_call = mock_client_instance.configurations._put.call_args
+        self.assertTrue(put_call[0][0].endswith("/keboola.app-data-gateway/configs/12345/state"))
+        checkpoint = json.loads(put_call[1]["json"]["state"])
+        self.assertEqual(checkpoint["component"]["tables"]["events_table"]["watermark"], "2024-01-15T09:00:00+00:00")
+
+        # the unchanged source is not skipped until the backfill is complete
+        mock_client_instance.jobs.detail.side_effect = [failed_job, job]  # the failed pending job, then the new one
+        comp = Component()
+        comp.params.incremental_slice_seconds = 3600
+        comp.params.skip_unchanged_tables = True
+        comp.transport.server_time = mock.Mock(return_value=1705312800)
+        comp.state = checkpoint["component"]
         comp.run()
+        self.assertEqual(mock_client_instance.workspaces.load_tables.call_count, 3)
+        mapping = mock_client_instance.workspaces.load_tables.call_args[1]["table_mapping"][0]
+        self.comparedict(mapping, {"changedSince": 1705309200, "changedUntil": 1705312800}, "Resumed slice")
+        self.assertEqual(
+            comp.state["tables"]["events_table"]["source_version"], "2024-01-15T08:00:00+0100|2024-01-15"
+        )
 
-        # Assert load_tables call
-        call_args = mock_client_instance.workspaces.load_tables.call_args
-        table_mapping = call_args[1]["table_mapping"]
-        mapping = table_mapping[0]
+    @freeze_time("2024-01-15 10:00:00")
+    @mock.patch("kbcstorage.client.Client")
+    @mock.patch.dict(
+        os.environ,
+        {
+            "KBC_DATADIR": "./tests/data/incremental_adaptive",
+            "KBC_STACKID": "connection.keboola.com",
+            "KBC_TOKEN": "test-token",
+            "KBC_CONFIGID": "12345",
+        },
+    )
+    def test_incremental_slices_stop_at_deadline(self, mock_client):
+        """Test no slice is submitted once the run deadline has passed and the loaded slices are kept"""
+        # Configure mock
+        mock_client_instance = mock_client.return_value
+        mock_client_instance.workspaces.load_tables.return_value = {"id": "12345"}
+        mock_client_instance.configurations.base_url = "https://connection.keboola.com/v2/storage/components"
+        mock_client_instance.configurations._get.return_value = {"state": {"storage": {}}}
+        job = {
+            "status": "success",
+            "id": "12345",
+            "createdTime": "2024-01-15T10:00:00+00:00",
+            "startTime": "2024-01-15T10:00:01+00:00",
+            "endTime": "2024-01-15T10:00:05+00:00",
+        }
 
-        # Check that CLONE loadType is set
-        self.comparedict(mapping, {"loadType": "CLONE"}, "Clone mode loadType")
+        def finish_at_deadline(job_id):
+            comp.deadline = 0  # the first slice uses up the run time
+            return job
 
-        # Check that changedSince and changedUntil are None (no time filtering in CLONE mode)
-        self.assertIsNone(mapping.get("changedSince"))
-        self.assertIsNone(mapping.get("changedUntil"))
+        mock_client_instance.jobs.detail.side_effect = finish_at_deadline
 
-        # Check that deprecated seconds field is not in mapping
-        self.assertNotIn("seconds", mapping)
+        comp = Component()
+        comp.params.incremental_slice_seconds = 3600
+        comp.params.run_timeout_seconds = 600
+        comp.transport.server_time = mock.Mock(return_value=1705312800)
+        comp.state = {"tables": {"events_table": {"watermark": 1705305600}}}
+        with self.assertRaisesRegex(UserException, "after 1 of 2 slices"):
+            comp.run()
 
-    # WORKSPACE RESOLUTION TESTS
+        mock_client_instance.workspaces.load_tables.assert_called_once()
+        put_call = mock_client_instance.configurations._put.call_args
+        checkpoint = json.loads(put_call[1]["json"]["state"])
+        self.assertEqual(checkpoint["component"]["tables"]["events_table"]["watermark"], "2024-01-15T09:00:00+00:00")
 
     @freeze_time("2024-01-15 10:00:00")
-    @mock.patch("component.Client")
+    @mock.patch("kbcstorage.client.Client")
     @mock.patch.dict(
         os.environ,
         {
-            "KBC_DATADIR": "./tests/data/workspace_from_config",
+            "KBC_DATADIR": "./tests/data/incremental_adaptive",
             "KBC_STACKID": "connection.keboola.com",
             "KBC_TOKEN": "test-token",
             "KBC_CONFIGID": "12345",
         },
     )
-    def test_workspace_from_config(self, mock_client):
-        """Test workspace ID is taken from config parameters"""
+    def test_incremental_not_sliced_without_preserve(self, mock_client):
+        """Test a long window loads whole when every job would drop the tables loaded by the previous slices"""
         # Configure mock
         mock_client_instance = mock_client.return_value
         mock_client_instance.workspaces.load_tables.return_value = {"id": "12345"}
@@ -517,35 +688,32 @@ class TestComponent(unittest.TestCase):
             "endTime": "2024-01-15T10:00:05+00:00",
         }
 
-        # Run component
         comp = Component()
+        comp.params.incremental_slice_seconds = 3600
+        comp.params.preserve_existing_tables = False
+        comp.transport.server_time = mock.Mock(return_value=1705312800)
+        comp.state = {"tables": {"events_table": {"watermark": 1705305600}}}
         comp.run()
 
-        # Assert workspace_id from config is used
-        call_args = mock_client_instance.workspaces.load_tables.call_args
-        self.assertEqual(call_args[1]["workspace_id"], 67890)
-
-        # Assert list_config_workspaces was NOT called
-        mock_client_instance.configurations.list_config_workspaces.assert_not_called()
+        mock_client_instance.workspaces.load_tables.assert_called_once()
+        mapping = mock_client_instance.workspaces.load_tables.call_args[1]["table_mapping"][0]
+        self.comparedict(mapping, {"changedSince": 1705305600, "changedUntil": 1705312800}, "Whole window")
 
     @freeze_time("2024-01-15 10:00:00")
-    @mock.patch("component.Client")
+    @mock.patch("kbcstorage.client.Client")
     @mock.patch.dict(
         os.environ,
         {
-            "KBC_DATADIR": "./tests/data/workspace_discovery",
+            "KBC_DATADIR": "./tests/data/incremental_adaptive",
             "KBC_STACKID": "connection.keboola.com",
             "KBC_TOKEN": "test-token",
             "KBC_CONFIGID": "12345",
         },
     )
-    def test_workspace_from_discovery(self, mock_client):
-        """Test workspace ID is discovered via API when not in config"""
+    def test_row_filter(self, mock_client):
+        """Test row filters are validated, passed to the load and a changed filter fully reloads the table"""
         # Configure mock
         mock_client_instance = mock_client.return_value
-        mock_client_instance.configurations.list_config_workspaces.return_value = [
-            {"id": 99999, "connection": {"backend": "snowflake"}}
-        ]
         mock_client_instance.workspaces.load_tables.return_value = {"id": "12345"}
         mock_client_instance.jobs.detail.return_value = {
             "status": "success",
@@ -555,129 +723,1180 @@ class TestComponent(unittest.TestCase):
             "endTime": "2024-01-15T10:00:05+00:00",
         }
 
-        # Run component
         comp = Component()
+        comp.params.where_column = "event_name"
+        comp.params.where_values = ["click", "view"]
         comp.run()
-
-        # Assert list_config_workspaces was called (component_id is positional)
-        mock_client_instance.configurations.list_config_workspaces.assert_called_once_with(
-            "keboola.app-data-gateway", config_id="12345"
+        mapping = mock_client_instance.workspaces.load_tables.call_args[1]["table_mapping"][0]
+        self.comparedict(
+            mapping, {"whereColumn": "event_name", "whereValues": ["click", "view"], "whereOperator": "eq"}, "Filter"
         )
 
-        # Assert discovered workspace_id is used
-        call_args = mock_client_instance.workspaces.load_tables.call_args
-        self.assertEqual(call_args[1]["workspace_id"], 99999)
+        # Changed filter values lead to a full reload
+        state = comp.state
+        comp = Component()
+        comp.state = state
+        comp.params.where_column = "event_name"
+        comp.params.where_values = ["click"]
+        comp.run()
+        mapping = mock_client_instance.workspaces.load_tables.call_args[1]["table_mapping"][0]
+        self.comparedict(mapping, {"incremental": False, "whereValues": ["click"]}, "Full reload")
 
-    # JOB POLLING TESTS
+        for column, values, error in [
+            ("country", ["CZ"], "is not a selected column"),
+            ("event_name", [], "has no values"),
+        ]:
+            comp = Component()
+            comp.params.where_column = column
+            comp.params.where_values = values
+            with self.assertRaises(UserException) as context:
+                comp.run()
+            self.assertIn(error, str(context.exception))
 
     @freeze_time("2024-01-15 10:00:00")
-    @mock.patch("component.time.sleep")  # Mock sleep to speed up test
-    @mock.patch("component.Client")
+    @mock.patch("kbcstorage.client.Client")
     @mock.patch.dict(
         os.environ,
         {
-            "KBC_DATADIR": "./tests/data/full_load_basic",
+            "KBC_DATADIR": "./tests/data/incremental_adaptive",
             "KBC_STACKID": "connection.keboola.com",
             "KBC_TOKEN": "test-token",
             "KBC_CONFIGID": "12345",
         },
     )
-    def test_job_success_polling(self, mock_client, mock_sleep):
-        """Test job polling continues until status is success"""
+    def test_preview_mode(self, mock_client):
+        """Test preview loads a limited full copy into a separate table and keeps the state of the real table"""
         # Configure mock
         mock_client_instance = mock_client.return_value
         mock_client_instance.workspaces.load_tables.return_value = {"id": "12345"}
+        mock_client_instance.jobs.detail.return_value = {
+            "status": "success",
+            "id": "12345",
+            "createdTime": "2024-01-15T10:00:00+00:00",
+            "startTime": "2024-01-15T10:00:01+00:00",
+            "endTime": "2024-01-15T10:00:05+00:00",
+        }
 
-        # Simulate multiple polling attempts
-        mock_client_instance.jobs.detail.side_effect = [
-            {"status": "processing", "id": "12345"},
-            {"status": "processing", "id": "12345"},
-            {
-                "status": "success",
-                "id": "12345",
-                "createdTime": "2024-01-15T10:00:00+00:00",
-                "startTime": "2024-01-15T10:00:01+00:00",
-                "endTime": "2024-01-15T10:00:05+00:00",
-            },
-        ]
-
-        # Run component
         comp = Component()
+        comp.params.preview_rows = 100
+        comp.state = {"tables": {"events_table": {"watermark": "2024-01-15T09:00:00+00:00"}}}
         comp.run()
 
-        # Assert jobs.detail was called 3 times
-        self.assertEqual(mock_client_instance.jobs.detail.call_count, 3)
+        mapping = mock_client_instance.workspaces.load_tables.call_args[1]["table_mapping"][0]
+        self.comparedict(
+            mapping,
+            {"destination": "events_table_preview", "rows": 100, "loadType": "COPY", "incremental": False},
+            "Preview",
+        )
+        self.assertIsNone(mapping["changedSince"])
+        self.assertEqual(comp.state["tables"], {"events_table": {"watermark": "2024-01-15T09:00:00+00:00"}})
+        self.assertEqual(comp.state["workspace_tables"], ["events_table_preview"])
 
-        # Assert all calls were with the same job_id
-        for call in mock_client_instance.jobs.detail.call_args_list:
-            self.assertEqual(call[0][0], "12345")
+        # the real tables are kept even when the workspace is not preserved between loads
+        comp = Component()
+        comp.params.preview_rows = 100
+        comp.params.preserve_existing_tables = False
+        comp.run()
+        call_args = mock_client_instance.workspaces.load_tables.call_args[1]
+        self.assertTrue(call_args["preserve"])
+        self.assertTrue(call_args["table_mapping"][0]["overwrite"])
+
+    # CLONE MODE TESTS
 
     @freeze_time("2024-01-15 10:00:00")
-    @mock.patch("component.time.sleep")  # Mock sleep to speed up test
-    @mock.patch("component.Client")
+    @mock.patch("kbcstorage.client.Client")
     @mock.patch.dict(
         os.environ,
         {
-            "KBC_DATADIR": "./tests/data/full_load_basic",
+            "KBC_DATADIR": "./tests/data/clone_mode",
             "KBC_STACKID": "connection.keboola.com",
             "KBC_TOKEN": "test-token",
             "KBC_CONFIGID": "12345",
         },
     )
-    def test_job_failure_raises_error(self, mock_client, mock_sleep):
-        """Test job failure raises UserException with error message"""
+    def test_clone_mode_basic(self, mock_client):
+        """Test clone mode sets load_type to CLONE and dropTimestampColumn"""
         # Configure mock
         mock_client_instance = mock_client.return_value
         mock_client_instance.workspaces.load_tables.return_value = {"id": "12345"}
         mock_client_instance.jobs.detail.return_value = {
+            "status": "success",
             "id": "12345",
-            "status": "error",
-            "error": {"message": "Table not found"},
+            "createdTime": "2024-01-15T10:00:00+00:00",
+            "startTime": "2024-01-15T10:00:01+00:00",
+            "endTime": "2024-01-15T10:00:05+00:00",
         }
 
-        # Run component - should raise exception
+        # Run component
         comp = Component()
-        with self.assertRaises(Exception) as context:
-            comp.run()
+        comp.run()
 
-        # Check error message contains the error from the job
-        self.assertIn("Table not found", str(context.exception))
+        # Assert load_tables call
+        call_args = mock_client_instance.workspaces.load_tables.call_args
+        table_mapping = call_args[1]["table_mapping"]
+        mapping = table_mapping[0]
 
-    # SYNC ACTION TESTS
+        # Check CLONE mode settings
+        self.comparedict(mapping, {"loadType": "CLONE", "dropTimestampColumn": True}, "Clone mode settings")
+
+        # In clone mode, changedSince and changedUntil are None (no time filtering)
+        self.assertIsNone(mapping.get("changedSince"))
+        self.assertIsNone(mapping.get("changedUntil"))
 
     @freeze_time("2024-01-15 10:00:00")
-    @mock.patch("component.time.sleep")  # Mock sleep to speed up test
-    @mock.patch("component.Client")
+    @mock.patch("kbcstorage.client.Client")
     @mock.patch.dict(
         os.environ,
         {
-            "KBC_DATADIR": "./tests/data/clean_workspace",
+            "KBC_DATADIR": "./tests/data/clone_mode",
             "KBC_STACKID": "connection.keboola.com",
             "KBC_TOKEN": "test-token",
             "KBC_CONFIGID": "12345",
         },
     )
-    def test_clean_workspace_action(self, mock_client, mock_sleep):
-        """Test clean_workspace sync action drops all tables"""
+    def test_clone_mode_removes_incompatible_fields(self, mock_client):
+        """Test clone mode uses CLONE loadType and doesn't have seconds field"""
         # Configure mock
         mock_client_instance = mock_client.return_value
         mock_client_instance.workspaces.load_tables.return_value = {"id": "12345"}
-        mock_client_instance.jobs.detail.return_value = {"status": "success", "id": "12345"}
+        mock_client_instance.jobs.detail.return_value = {
+            "status": "success",
+            "id": "12345",
+            "createdTime": "2024-01-15T10:00:00+00:00",
+            "startTime": "2024-01-15T10:00:01+00:00",
+            "endTime": "2024-01-15T10:00:05+00:00",
+        }
 
-        # Run sync action directly
+        # Run component
         comp = Component()
-        result = comp.clean_workspace()
+        comp.run()
 
-        # Assert load_tables was called with empty table_mapping
+        # Assert load_tables call
         call_args = mock_client_instance.workspaces.load_tables.call_args
-        self.comparedict(
-            call_args[1],
-            {"workspace_id": 12345, "table_mapping": [], "preserve": False, "load_type": "load"},
-            "clean_workspace parameters",
-        )
+        table_mapping = call_args[1]["table_mapping"]
+        mapping = table_mapping[0]
 
-        # Assert success result
-        self.assertEqual(result.message, "Workspace cleaned successfully")
+        # Check that CLONE loadType is set
+        self.comparedict(mapping, {"loadType": "CLONE"}, "Clone mode loadType")
+
+        # Check that changedSince and changedUntil are None (no time filtering in CLONE mode)
+        self.assertIsNone(mapping.get("changedSince"))
+        self.assertIsNone(mapping.get("changedUntil"))
+
+        # Check that deprecated seconds field is not in mapping
+        self.assertNotIn("seconds", mapping)
+
+    # MULTI-TABLE TESTS
+
+    @freeze_time("2024-01-15 10:00:00")
+    @mock.patch("kbcstorage.client.Client")
+    @mock.patch.dict(
+        os.environ,
+        {
+            "KBC_DATADIR": "./tests/data/multi_table",
+            "KBC_STACKID": "connection.keboola.com",
+            "KBC_TOKEN": "test-token",
+            "KBC_CONFIGID": "12345",
+        },
+    )
+    def test_multi_table_single_job(self, mock_client):
+        """Test all configured tables are loaded in one job, each with its own settings"""
+        # Configure mock
+        mock_client_instance = mock_client.return_value
+        mock_client_instance.workspaces.load_tables.return_value = {"id": "12345"}
+        mock_client_instance.jobs.detail.return_value = {
+            "status": "success",
+            "id": "12345",
+            "createdTime": "2024-01-15T10:00:00+00:00",
+            "startTime": "2024-01-15T10:00:01+00:00",
+            "endTime": "2024-01-15T10:00:05+00:00",
+        }
+
+        # Run component
+        comp = Component()
+        comp.run()
+
+        # Assert exactly one load job with all tables
+        mock_client_instance.workspaces.load_tables.assert_called_once()
+        table_mapping = mock_client_instance.workspaces.load_tables.call_args[1]["table_mapping"]
+        self.assertEqual([t["destination"] for t in table_mapping], ["users_table", "orders_table", "events_table"])
+
+        users, orders, events = table_mapping
+        self.comparedict(users, {"source": "in.c-main.users", "loadType": "COPY", "overwrite": True}, "Users")
+        self.assertEqual(users["primaryKey"]["columns"], ["id"])
+        self.comparedict(orders, {"loadType": "CLONE", "dropTimestampColumn": True}, "Orders")
+        self.comparedict(events, {"incremental": True, "changedSince": 1, "changedUntil": 1705312800}, "Events")
+        self.assertNotIn("overwrite", events)
+        self.assertEqual(events["columns"][0]["type"], "TEXT")
+
+    @freeze_time("2024-01-15 10:00:00")
+    @mock.patch("kbcstorage.client.Client")
+    @mock.patch.dict(
+        os.environ,
+        {
+            "KBC_DATADIR": "./tests/data/multi_table",
+            "KBC_STACKID": "connection.keboola.com",
+            "KBC_TOKEN": "test-token",
+            "KBC_CONFIGID": "12345",
+        },
+    )
+    def test_multi_table_duplicate_destination(self, mock_client):
+        """Test that two tables cannot be loaded into the same destination"""
+        comp = Component()
+        comp.params.tables[1].destination_table_name = "users_table"
+
+        with self.assertRaises(Exception) as context:
+            comp.run()
+
+        self.assertIn("users_table", str(context.exception))
+        mock_client.return_value.workspaces.load_tables.assert_not_called()
+
+    @freeze_time("2024-01-15 10:00:00")
+    @mock.patch("kbcstorage.client.Client")
+    @mock.patch.dict(
+        os.environ,
+        {
+            "KBC_DATADIR": "./tests/data/multi_table",
+            "KBC_STACKID": "connection.keboola.com",
+            "KBC_TOKEN": "test-token",
+            "KBC_CONFIGID": "12345",
+        },
+    )
+    def test_multi_table_parallel_jobs(self, mock_client):
+        """Test parallel mode submits one job per table, smallest tables first"""
+        # Configure mock
+        mock_client_instance = mock_client.return_value
+        mock_client_instance.tables.list.return_value = [
+            {"id": "in.c-main.users", "dataSizeBytes": 5000},
+            {"id": "in.c-main.orders", "dataSizeBytes": 90000},
+            {"id": "in.c-main.events", "dataSizeBytes": 100},
+        ]
+        mock_client_instance.workspaces.load_tables.return_value = {"id": "12345"}
+        mock_client_instance.jobs.detail.return_value = {
+            "status": "success",
+            "id": "12345",
+            "createdTime": "2024-01-15T10:00:00+00:00",
+            "startTime": "2024-01-15T10:00:01+00:00",
+            "endTime": "2024-01-15T10:00:05+00:00",
+        }
+
+        comp = Component()
+        comp.params.parallel_jobs = 2
+        comp.run()
+
+        self.assertEqual(mock_client_instance.workspaces.load_tables.call_count, 3)
+        calls = mock_client_instance.workspaces.load_tables.call_args_list
+        destinations = {c[1]["table_mapping"][0]["destination"] for c in calls}
+        self.assertEqual(destinations, {"users_table", "orders_table", "events_table"})
+
+        # CLONE is zero-copy so it goes first, then by data size
+        batches = comp.split_table_mapping(comp.build_table_mapping())
+        self.assertEqual(
+            [batch[0]["destination"] for batch in batches], ["orders_table", "events_table", "users_table"]
+        )
+
+    @freeze_time("2024-01-15 10:00:00")
+    @mock.patch("kbcstorage.client.Client")
+    @mock.patch.dict(
+        os.environ,
+        {
+            "KBC_DATADIR": "./tests/data/multi_table",
+            "KBC_STACKID": "connection.keboola.com",
+            "KBC_TOKEN": "test-token",
+            "KBC_CONFIGID": "12345",
+        },
+    )
+    def test_skip_unchanged_tables(self, mock_client):
+        """Test tables whose source did not change since the last load are not loaded again"""
+        # Configure mock
+        mock_client_instance = mock_client.return_value
+        tables = [
+            {"id": "in.c-main.users", "lastImportDate": "2024-01-15T08:00:00+0100", "lastChangeDate": "2024-01-15"},
+            {"id": "in.c-main.orders", "lastImportDate": "2024-01-15T08:00:00+0100", "lastChangeDate": "2024-01-15"},
+            {"id": "in.c-main.events", "lastImportDate": "2024-01-15T08:00:00+0100", "lastChangeDate": "2024-01-15"},
+        ]
+        mock_client_instance.tables.list.return_value = tables
+        mock_client_instance.workspaces.load_tables.return_value = {"id": "12345"}
+        mock_client_instance.jobs.detail.return_value = {
+            "status": "success",
+            "id": "12345",
+            "createdTime": "2024-01-15T10:00:00+00:00",
+            "startTime": "2024-01-15T10:00:01+00:00",
+            "endTime": "2024-01-15T10:00:05+00:00",
+        }
+
+        # First run loads everything and remembers the source versions
+        comp = Component()
+        comp.params.skip_unchanged_tables = True
+        comp.run()
+        self.assertEqual(len(mock_client_instance.workspaces.load_tables.call_args[1]["table_mapping"]), 3)
+        state = comp.state
+
+        # Nothing changed, no job is submitted
+        mock_client_instance.workspaces.load_tables.reset_mock()
+        comp = Component()
+        comp.params.skip_unchanged_tables = True
+        comp.state = state
+        comp.run()
+        mock_client_instance.workspaces.load_tables.assert_not_called()
+        self.assertEqual(comp.report.to_dict()["skipped_tables"], 3)
+
+        # Only the changed table is loaded
+        tables[2]["lastImportDate"] = "2024-01-15T09:30:00+0100"
+        comp = Component()
+        comp.params.skip_unchanged_tables = True
+        comp.state = state
+        comp.run()
+        table_mapping = mock_client_instance.workspaces.load_tables.call_args[1]["table_mapping"]
+        self.assertEqual([t["destination"] for t in table_mapping], ["events_table"])
+
+    @freeze_time("2024-01-15 10:00:00")
+    @mock.patch("kbcstorage.client.Client")
+    @mock.patch.dict(
+        os.environ,
+        {
+            "KBC_DATADIR": "./tests/data/full_load_with_pk",
+            "KBC_STACKID": "connection.keboola.com",
+            "KBC_TOKEN": "test-token",
+            "KBC_CONFIGID": "12345",
+        },
+    )
+    def test_auto_load_strategy(self, mock_client):
+        """Test auto strategy switches a large typed table to incremental loads after its first load"""
+        # Configure mock
+        mock_client_instance = mock_client.return_value
+        mock_client_instance.tables.list.return_value = [{"id": "in.c-main.products", "rowsCount": 5_000_000}]
+        mock_client_instance.workspaces.load_tables.return_value = {"id": "12345"}
+        mock_client_instance.jobs.detail.return_value = {
+            "status": "success",
+            "id": "12345",
+            "createdTime": "2024-01-15T10:00:00+00:00",
+            "startTime": "2024-01-15T10:00:01+00:00",
+            "endTime": "2024-01-15T10:00:05+00:00",
+        }
+
+        comp = Component()
+        comp.params.load_strategy = "auto"
+        comp.run()
+        mapping = mock_client_instance.workspaces.load_tables.call_args[1]["table_mapping"][0]
+        self.comparedict(mapping, {"loadType": "COPY", "incremental": False, "overwrite": True}, "First load")
+
+        state = comp.state
+        comp = Component()
+        comp.params.load_strategy = "auto"
+        comp.state = state
+        comp.run()
+        mapping = mock_client_instance.workspaces.load_tables.call_args[1]["table_mapping"][0]
+        self.comparedict(mapping, {"loadType": "COPY", "incremental": True, "changedSince": 1705312800}, "Next load")
+        mock_client_instance.tables.list.assert_called_with(include=["columns"])
+
+        # rows deleted in the source are removed by a full reload
+        mock_client_instance.tables.list.return_value = [{"id": "in.c-main.products", "rowsCount": 4_000_000}]
+        comp = Component()
+        comp.params.load_strategy = "auto"
+        comp.state = state
+        comp.run()
+        mapping = mock_client_instance.workspaces.load_tables.call_args[1]["table_mapping"][0]
+        self.comparedict(mapping, {"loadType": "COPY", "incremental": False, "overwrite": True}, "Deleted rows")
+
+    @freeze_time("2024-01-15 10:00:00")
+    @mock.patch("kbcstorage.client.Client")
+    @mock.patch.dict(
+        os.environ,
+        {
+            "KBC_DATADIR": "./tests/data/full_load_with_pk",
+            "KBC_STACKID": "connection.keboola.com",
+            "KBC_TOKEN": "test-token",
+            "KBC_CONFIGID": "12345",
+        },
+    )
+    def test_auto_load_strategy_without_preserve(self, mock_client):
+        """Test auto strategy keeps full loads when the workspace is not preserved and clones pass-through columns"""
+        # Configure mock
+        mock_client_instance = mock_client.return_value
+        mock_client_instance.tables.list.side_effect = lambda include=None: [
+            {"id": "in.c-main.products", "rowsCount": 5_000_000, **({"columns": ["id", "sku"]} if include else {})}
+        ]
+        mock_client_instance.workspaces.load_tables.return_value = {"id": "12345"}
+        mock_client_instance.jobs.detail.return_value = {
+            "status": "success",
+            "id": "12345",
+            "createdTime": "2024-01-15T10:00:00+00:00",
+            "startTime": "2024-01-15T10:00:01+00:00",
+            "endTime": "2024-01-15T10:00:05+00:00",
+        }
+
+        state = {}
+        for _ in range(2):
+            comp = Component()
+            comp.params.load_strategy = "auto"
+            comp.params.preserve_existing_tables = False
+            comp.state = state
+            comp.run()
+            state = comp.state
+            mapping = mock_client_instance.workspaces.load_tables.call_args[1]["table_mapping"][0]
+            self.comparedict(mapping, {"loadType": "COPY", "incremental": False}, "Not preserved")
+
+        # a column list selecting all source columns as they are is cloned
+        comp = Component()
+        comp.params.load_strategy = "auto"
+        comp.params.items = [item.model_copy(update={"size": ""}) for item in comp.params.items[:2]]
+        comp.storage_input = comp.load_storage_input()
+        comp.start_timestamp = 1705312800
+        mapping = comp.build_table_mapping()[0]
+        self.assertEqual(mapping["loadType"], "CLONE")
+
+    @freeze_time("2024-01-15 10:00:00")
+    @mock.patch("kbcstorage.client.Client")
+    @mock.patch.dict(
+        os.environ,
+        {
+            "KBC_DATADIR": "./tests/data/full_load_basic",
+            "KBC_STACKID": "connection.keboola.com",
+            "KBC_TOKEN": "test-token",
+            "KBC_CONFIGID": "12345",
+        },
+    )
+    def test_derive_column_types(self, mock_client):
+        """Test missing items are typed from storage metadata at run time and cached for the sync action"""
+        # Configure mock
+        mock_client_instance = mock_client.return_value
+        mock_client_instance.tables.list.return_value = [
+            {
+                "id": "in.c-main.users",
+                "columns": ["id", "name"],
+                "columnMetadata": {
+                    "id": [{"key": "KBC.datatype.basetype", "value": "INTEGER"}],
+                    "name": [{"key": "KBC.datatype.basetype", "value": "STRING"}],
+                },
+            }
+        ]
+        mock_client_instance.configurations._get.return_value = {"state": {}}
+        mock_client_instance.workspaces.load_tables.return_value = {"id": "12345"}
+        mock_client_instance.jobs.detail.return_value = {
+            "status": "success",
+            "id": "12345",
+            "createdTime": "2024-01-15T10:00:00+00:00",
+            "startTime": "2024-01-15T10:00:01+00:00",
+            "endTime": "2024-01-15T10:00:05+00:00",
+        }
+
+        comp = Component()
+        comp.params.items = []
+        comp.params.derive_column_types = True
+        comp.run()
+
+        mock_client_instance.tables.list.assert_called_once_with(include=["columns", "columnMetadata"])
+        mapping = mock_client_instance.workspaces.load_tables.call_args[1]["table_mapping"][0]
+        self.assertEqual([(c["source"], c["type"]) for c in mapping["columns"]], [("id", "NUMBER"), ("name", "VARCHAR")])
+
+        # the sync action answers from the cached metadata
+        mock_client_instance.configurations._put.reset_mock()
+        state = comp.state
+        comp = Component()
+        comp.state = state
+        result = comp.derive_column_types()
+        self.assertEqual([item["type"] for item in result["tables"][0]["items"]], ["NUMBER", "VARCHAR"])
+        mock_client_instance.tables.list.assert_called_once()
+        mock_client_instance.configurations._put.assert_not_called()
+
+        # an expired cache is refreshed and stored in the configuration state
+        with freeze_time("2024-01-15 12:00:00"):
+            comp.derive_column_types()
+        self.assertEqual(mock_client_instance.tables.list.call_count, 2)
+        stored = json.loads(mock_client_instance.configurations._put.call_args[1]["json"]["state"])
+        self.assertIn("in.c-main.users", stored["component"]["column_types"])
+
+    @freeze_time("2024-01-15 10:00:00")
+    @mock.patch("kbcstorage.client.Client")
+    @mock.patch.dict(
+        os.environ,
+        {
+            "KBC_DATADIR": "./tests/data/multi_table",
+            "KBC_STACKID": "connection.keboola.com",
+            "KBC_TOKEN": "test-token",
+            "KBC_CONFIGID": "12345",
+        },
+    )
+    def test_plan_action(self, mock_client):
+        """Test the plan action returns the payload of run with size and duration estimates without loading"""
+        # Configure mock
+        mock_client_instance = mock_client.return_value
+        mock_client_instance.tables.list.return_value = [
+            {"id": "in.c-main.users", "rowsCount": 10, "dataSizeBytes": 1024},
+            {"id": "in.c-main.orders", "rowsCount": 500, "dataSizeBytes": 4096},
+        ]
+        mock_client_instance.workspaces.load_tables.return_value = {"id": "12345"}
+        mock_client_instance.jobs.detail.return_value = {
+            "status": "success",
+            "id": "12345",
+            "createdTime": "2024-01-15T10:00:00+00:00",
+            "startTime": "2024-01-15T10:00:01+00:00",
+            "endTime": "2024-01-15T10:00:05+00:00",
+        }
+
+        comp = Component()
+        comp.transport.server_time = mock.Mock(return_value=1705312800)
+        comp.run()
+        submitted = mock_client_instance.workspaces.load_tables.call_args[1]["table_mapping"]
+
+        state = comp.state
+        comp = Component()
+        comp.transport.server_time = mock.Mock(return_value=1705312800)
+        comp.state = state
+        plan = comp.plan()
+
+        mock_client_instance.workspaces.load_tables.assert_called_once()
+        self.assertEqual([t["destination"] for t in plan["mapping"]], [t["destination"] for t in submitted])
+        self.assertEqual(plan["tables"][1]["load_type"], "CLONE")
+        self.comparedict(
+            plan["tables"][2], {"incremental": True, "changed_since": 1705312800, "changed_until": 1705312800}, "Window"
+        )
+        self.comparedict(
+            plan, {"jobs": 1, "estimated_rows": 510, "estimated_bytes": 5120, "estimated_seconds": 5.0}, "Estimates"
+        )
+
+    @freeze_time("2024-01-15 10:00:00")
+    @mock.patch("kbcstorage.client.Client")
+    @mock.patch.dict(
+        os.environ,
+        {
+            "KBC_DATADIR": "./tests/data/full_load_with_pk",
+            "KBC_STACKID": "connection.keboola.com",
+            "KBC_TOKEN": "test-token",
+            "KBC_CONFIGID": "12345",
+        },
+    )
+    def test_delta_full_load(self, mock_client):
+        """Test a delta full load upserts a slightly grown table and overwrites it after deletes"""
+        # Configure mock
+        mock_client_instance = mock_client.return_value
+        mock_client_instance.workspaces.load_tables.return_value = {"id": "12345"}
+        mock_client_instance.jobs.detail.return_value = {
+            "status": "success",
+            "id": "12345",
+            "createdTime": "2024-01-15T10:00:00+00:00",
+            "startTime": "2024-01-15T10:00:01+00:00",
+            "endTime": "2024-01-15T10:00:05+00:00",
+        }
+
+        state = {}
+        mappings = []
+        for rows in (1000, 1010, 900):
+            mock_client_instance.tables.list.return_value = [{"id": "in.c-main.products", "rowsCount": rows}]
+            comp = Component()
+            comp.params.full_load_mode = "delta"
+            comp.transport.server_time = mock.Mock(return_value=1705312800)
+            comp.state = state
+            comp.run()
+            state = comp.state
+            mappings.append(mock_client_instance.workspaces.load_tables.call_args[1]["table_mapping"][0])
+
+        self.comparedict(mappings[0], {"incremental": False, "overwrite": True}, "First load")
+        self.comparedict(mappings[1], {"incremental": True, "changedSince": 1705312800}, "Small growth")
+        self.assertNotIn("overwrite", mappings[1])
+        self.comparedict(mappings[2], {"incremental": False, "overwrite": True}, "Deleted rows")
+        self.comparedict(state["tables"]["products_table"], {"rows_count": 900}, "State")
+
+        # full loads take their watermark from the Storage API clock, not the container clock
+        mock_client_instance.jobs.detail.return_value = {
+            "status": "success",
+            "id": "12345",
+            "createdTime": "2024-01-15T09:59:50+00:00",
+            "startTime": "2024-01-15T09:59:51+00:00",
+            "endTime": "2024-01-15T09:59:55+00:00",
+        }
+        comp = Component()
+        comp.params.full_load_mode = "delta"
+        comp.state = {}
+        comp.run()
+        self.comparedict(
+            comp.state["tables"]["products_table"],
+            {"watermark": "2024-01-15T09:59:50+00:00", "full_load_at": "2024-01-15T09:59:50+00:00"},
+            "Server time",
+        )
+
+    @freeze_time("2024-01-15 10:00:00")
+    @mock.patch("kbcstorage.client.Client")
+    @mock.patch.dict(
+        os.environ,
+        {
+            "KBC_DATADIR": "./tests/data/incremental_adaptive",
+            "KBC_STACKID": "connection.keboola.com",
+            "KBC_TOKEN": "test-token",
+            "KBC_CONFIGID": "12345",
+        },
+    )
+    def test_fire_and_forget(self, mock_client):
+        """Test submitted jobs move the watermark only after a later run sees them succeed"""
+        # Configure mock
+        mock_client_instance = mock_client.return_value
+        mock_client_instance.workspaces.load_tables.return_value = {"id": "12345", "status": "waiting"}
+
+        comp = Component()
+        comp.params.wait_for_jobs = False
+        comp.params.skip_unchanged_tables = True
+        comp.get_source_version = mock.Mock(return_value="2024-01-15T09:00:00+0100")
+        comp.skip_unchanged_tables = mock.Mock(side_effect=lambda mapping: mapping)
+        comp.run()
+
+        mock_client_instance.jobs.detail.assert_not_called()
+        state = comp.state
+        self.assertEqual(state["last_run"], 1705309200.0)
+        self.assertNotIn("events_table", state.get("tables", {}))
+        self.comparedict(
+            state["submitted_jobs"][0]["tables"][0],
+            {
+                "destination": "events_table",
+                "watermark": "2024-01-15T10:00:00+00:00",
+                "source_version": "2024-01-15T09:00:00+0100",
+            },
+            "Submitted",
+        )
+
+        # the table is not submitted again while its job is running
+        mock_client_instance.jobs.detail.return_value = {"id": "12345", "status": "processing"}
+        with freeze_time("2024-01-15 11:00:00"):
+            comp = Component()
+            comp.state = state
+            comp.run()
+        mock_client_instance.workspaces.load_tables.assert_called_once()
+        self.assertEqual(len(state["submitted_jobs"]), 1)
+
+        # a succeeded job moves the watermark the next window starts from
+        mock_client_instance.jobs.detail.return_value = {
+            "id": "12345",
+            "status": "success",
+            "createdTime": "2024-01-15T10:00:00+00:00",
+            "startTime": "2024-01-15T10:00:30+00:00",
+            "endTime": "2024-01-15T10:02:00+00:00",
+        }
+        with freeze_time("2024-01-15 12:00:00"):
+            comp = Component()
+            comp.params.wait_for_jobs = False
+            comp.state = state
+            comp.run()
+        mapping = mock_client_instance.workspaces.load_tables.call_args[1]["table_mapping"][0]
+        self.comparedict(mapping, {"changedSince": 1705312800, "changedUntil": 1705320000}, "Next window")
+        self.comparedict(
+            state["tables"]["events_table"],
+            {
+                "watermark": "2024-01-15T10:00:00+00:00",
+                "source_version": "2024-01-15T09:00:00+0100",
+                "job_seconds": 120.0,
+            },
+            "Finalized",
+        )
+        self.comparedict(
+            state["job_history"]["events_table"], {"queue_seconds": [30.0], "processing_seconds": [90.0]}, "History"
+        )
+        self.assertNotIn("polls", state["job_history"]["events_table"])
+        self.assertEqual(state["submitted_jobs"][0]["tables"][0]["watermark"], "2024-01-15T12:00:00+00:00")
+
+    @freeze_time("2024-01-15 10:00:00")
+    @mock.patch("kbcstorage.client.Client")
+    @mock.patch.dict(
+        os.environ,
+        {
+            "KBC_DATADIR": "./tests/data/incremental_adaptive",
+            "KBC_STACKID": "connection.keboola.com",
+            "KBC_TOKEN": "test-token",
+            "KBC_CONFIGID": "12345",
+        },
+    )
+    def test_job_status_action(self, mock_client):
+        """Test the job status action reports submitted jobs and keeps watermarks of failed ones"""
+        # Configure mock
+        mock_client_instance = mock_client.return_value
+        mock_client_instance.configurations.base_url = "https://connection.keboola.com/v2/storage/components"
+        submitted = {
+            "id": "12345",
+            "submitted_at": "2024-01-15T10:00:00+00:00",
+            "tables": [{"destination": "events_table", "source": "in.c-main.events", "watermark": "x"}],
+        }
+        mock_client_instance.configurations._get.return_value = {"state": {"component": {"submitted_jobs": [submitted]}}}
+        mock_client_instance.jobs.detail.return_value = {"id": "12345", "status": "error"}
+
+        result = Component().job_status()
+
+        self.assertEqual(
+            result,
+            {
+                "jobs": [
+                    {
+                        "id": "12345",
+                        "status": "error",
+                        "submittedAt": "2024-01-15T10:00:00+00:00",
+                        "tables": ["events_table"],
+                    }
+                ]
+            },
+        )
+        stored = json.loads(mock_client_instance.configurations._put.call_args[1]["json"]["state"])
+        self.assertEqual(stored["component"], {"submitted_jobs": []})
+
+        # unknown jobs are failed, running ones are given up after a day
+        not_found = HTTPError(response=mock.Mock(status_code=404))
+        mock_client_instance.jobs.detail.side_effect = [not_found, {"id": "12346", "status": "processing"}]
+        old = {**submitted, "id": "12346", "submitted_at": "2024-01-14T09:00:00+00:00"}
+        state = {"submitted_jobs": [submitted, old]}
+
+        statuses = Component().finalize_submitted_jobs(state)
+
+        self.assertEqual([job["status"] for job in statuses], ["not_found", "expired"])
+        self.assertEqual(state["submitted_jobs"], [])
+
+        # a configuration row finalizes its own jobs, the row id of sync actions comes from the config file
+        mock_client_instance.jobs.detail.side_effect = None
+        mock_client_instance.jobs.detail.return_value = {"id": "12345", "status": "success"}
+        mock_client_instance.configurations._get.return_value = {"state": {"component": {"submitted_jobs": [submitted]}}}
+        comp = Component()
+        comp.configuration.config_data["configRowId"] = "7"
+        self.assertEqual(comp.job_status()["jobs"][0]["status"], "success")
+        mock_client_instance.configurations._get.assert_called_with(
+            "https://connection.keboola.com/v2/storage/components/keboola.app-data-gateway/configs/12345/rows/7"
+        )
+        put_call = mock_client_instance.configurations._put.call_args
+        self.assertTrue(put_call[0][0].endswith("/configs/12345/rows/7/state"))
+        stored = json.loads(put_call[1]["json"]["state"])
+        self.assertEqual(stored["component"]["tables"]["events_table"]["watermark"], "x")
+
+    # WORKSPACE RESOLUTION TESTS
+
+    @freeze_time("2024-01-15 10:00:00")
+    @mock.patch("kbcstorage.client.Client")
+    @mock.patch.dict(
+        os.environ,
+        {
+            "KBC_DATADIR": "./tests/data/workspace_from_config",
+            "KBC_STACKID": "connection.keboola.com",
+            "KBC_TOKEN": "test-token",
+            "KBC_CONFIGID": "12345",
+        },
+    )
+    def test_workspace_from_config(self, mock_client):
+        """Test workspace ID is taken from config parameters"""
+        # Configure mock
+        mock_client_instance = mock_client.return_value
+        mock_client_instance.workspaces.load_tables.return_value = {"id": "12345"}
+        mock_client_instance.jobs.detail.return_value = {
+            "status": "success",
+            "id": "12345",
+            "createdTime": "2024-01-15T10:00:00+00:00",
+            "startTime": "2024-01-15T10:00:01+00:00",
+            "endTime": "2024-01-15T10:00:05+00:00",
+        }
+
+        # Run component
+        comp = Component()
+        comp.run()
+
+        # Assert workspace_id from config is used
+        call_args = mock_client_instance.workspaces.load_tables.call_args
+        self.assertEqual(call_args[1]["workspace_id"], 67890)
+
+        # Assert list_config_workspaces was NOT called
+        mock_client_instance.configurations.list_config_workspaces.assert_not_called()
+
+    @freeze_time("2024-01-15 10:00:00")
+    @mock.patch("kbcstorage.client.Client")
+    @mock.patch.dict(
+        os.environ,
+        {
+            "KBC_DATADIR": "./tests/data/workspace_discovery",
+            "KBC_STACKID": "connection.keboola.com",
+            "KBC_TOKEN": "test-token",
+            "KBC_CONFIGID": "12345",
+        },
+    )
+    def test_workspace_from_discovery(self, mock_client):
+        """Test workspace ID is discovered via API when not in config"""
+        # Configure mock
+        mock_client_instance = mock_client.return_value
+        mock_client_instance.configurations.list_config_workspaces.return_value = [
+            {"id": 99999, "connection": {"backend": "snowflake"}}
+        ]
+        mock_client_instance.workspaces.load_tables.return_value = {"id": "12345"}
+        mock_client_instance.jobs.detail.return_value = {
+            "status": "success",
+            "id": "12345",
+            "createdTime": "2024-01-15T10:00:00+00:00",
+            "startTime": "2024-01-15T10:00:01+00:00",
+            "endTime": "2024-01-15T10:00:05+00:00",
+        }
+
+        # Run component
+        comp = Component()
+        comp.run()
+
+        # Assert list_config_workspaces was called (component_id is positional)
+        mock_client_instance.configurations.list_config_workspaces.assert_called_once_with(
+            "keboola.app-data-gateway", config_id="12345"
+        )
+
+        # Assert discovered workspace_id is used
+        call_args = mock_client_instance.workspaces.load_tables.call_args
+        self.assertEqual(call_args[1]["workspace_id"], 99999)
+
+    @freeze_time("2024-01-15 10:00:00")
+    @mock.patch("kbcstorage.client.Client")
+    @mock.patch.dict(
+        os.environ,
+        {
+            "KBC_DATADIR": "./tests/data/workspace_discovery",
+            "KBC_STACKID": "connection.keboola.com",
+            "KBC_TOKEN": "test-token",
+            "KBC_CONFIGID": "12345",
+        },
+    )
+    def test_workspace_from_state_cache(self, mock_client):
+        """Test discovered workspace ID is cached in state and reused while fresh"""
+        # Configure mock
+        mock_client_instance = mock_client.return_value
+        mock_client_instance.configurations.list_config_workspaces.return_value = [{"id": 99999}]
+        mock_client_instance.workspaces.load_tables.return_value = {"id": "12345"}
+        mock_client_instance.jobs.detail.return_value = {
+            "status": "success",
+            "id": "12345",
+            "createdTime": "2024-01-15T10:00:00+00:00",
+            "startTime": "2024-01-15T10:00:01+00:00",
+            "endTime": "2024-01-15T10:00:05+00:00",
+        }
+
+        # First run resolves the workspace and stores it in state
+        comp = Component()
+        comp.run()
+        with open("./tests/data/workspace_discovery/out/state.json") as f:
+            state = json.load(f)
+        self.assertEqual(state["workspace"], {"id": 99999, "resolved_at": 1705312800})
+
+        # Second run reuses the cached ID
+        mock_client_instance.configurations.list_config_workspaces.reset_mock()
+        comp = Component()
+        comp.state = state
+        comp.run()
+        mock_client_instance.configurations.list_config_workspaces.assert_not_called()
+        self.assertEqual(mock_client_instance.workspaces.load_tables.call_args[1]["workspace_id"], 99999)
+
+        # Expired cache is resolved again
+        comp = Component()
+        comp.state = {"workspace": {"id": 11111, "resolved_at": 1705312800 - 7200}}
+        comp.run()
+        mock_client_instance.configurations.list_config_workspaces.assert_called_once()
+        self.assertEqual(mock_client_instance.workspaces.load_tables.call_args[1]["workspace_id"], 99999)
+
+    @freeze_time("2024-01-15 10:00:00")
+    @mock.patch("kbcstorage.client.Client")
+    @mock.patch.dict(
+        os.environ,
+        {
+            "KBC_DATADIR": "./tests/data/workspace_discovery",
+            "KBC_STACKID": "connection.keboola.com",
+            "KBC_TOKEN": "test-token",
+            "KBC_CONFIGID": "12345",
+        },
+    )
+    def test_workspace_cache_not_found(self, mock_client):
+        """Test a cached workspace that no longer exists is dropped and resolved again"""
+        # Configure mock
+        mock_client_instance = mock_client.return_value
+        mock_client_instance.configurations.list_config_workspaces.return_value = [{"id": 99999}]
+        not_found = HTTPError(response=mock.Mock(status_code=404, text="Workspace not found"))
+        mock_client_instance.workspaces.load_tables.side_effect = [not_found, {"id": "12345"}]
+        mock_client_instance.jobs.detail.return_value = {
+            "status": "success",
+            "id": "12345",
+            "createdTime": "2024-01-15T10:00:00+00:00",
+            "startTime": "2024-01-15T10:00:01+00:00",
+            "endTime": "2024-01-15T10:00:05+00:00",
+        }
+
+        comp = Component()
+        comp.state = {"workspace": {"id": 11111, "resolved_at": 1705312800}}
+        comp.run()
+
+        workspace_ids = [c[1]["workspace_id"] for c in mock_client_instance.workspaces.load_tables.call_args_list]
+        self.assertEqual(workspace_ids, [11111, 99999])
+        self.assertEqual(comp.state["workspace"]["id"], 99999)
+
+    # JOB POLLING TESTS
+
+    @freeze_time("2024-01-15 10:00:00")
+    @mock.patch("component.time.sleep")  # Mock sleep to speed up test
+    @mock.patch("kbcstorage.client.Client")
+    @mock.patch.dict(
+        os.environ,
+        {
+            "KBC_DATADIR": "./tests/data/full_load_basic",
+            "KBC_STACKID": "connection.keboola.com",
+            "KBC_TOKEN": "test-token",
+            "KBC_CONFIGID": "12345",
+        },
+    )
+    def test_job_success_polling(self, mock_client, mock_sleep):
+        """Test job polling continues until status is success"""
+        # Configure mock
+        mock_client_instance = mock_client.return_value
+        mock_client_instance.workspaces.load_tables.return_value = {"id": "12345"}
+
+        # Simulate multiple polling attempts
+        mock_client_instance.jobs.detail.side_effect = [
+            {"status": "processing", "id": "12345"},
+            {"status": "processing", "id": "12345"},
+            {
+                "status": "success",
+                "id": "12345",
+                "createdTime": "2024-01-15T10:00:00+00:00",
+                "startTime": "2024-01-15T10:00:01+00:00",
+                "endTime": "2024-01-15T10:00:05+00:00",
+            },
+        ]
+
+        # Run component
+        comp = Component()
+        comp.run()
+
+        # Assert jobs.detail was called 3 times
+        self.assertEqual(mock_client_instance.jobs.detail.call_count, 3)
+
+        # Assert all calls were with the same job_id
+        for call in mock_client_instance.jobs.detail.call_args_list:
+            self.assertEqual(call[0][0], "12345")
+
+    @freeze_time("2024-01-15 10:00:00")
+    @mock.patch("component.time.sleep")  # Mock sleep to speed up test
+    @mock.patch("kbcstorage.client.Client")
+    @mock.patch.dict(
+        os.environ,
+        {
+            "KBC_DATADIR": "./tests/data/full_load_basic",
+            "KBC_STACKID": "connection.keboola.com",
+            "KBC_TOKEN": "test-token",
+            "KBC_CONFIGID": "12345",
+        },
+    )
+    def test_job_failure_raises_error(self, mock_client, mock_sleep):
+        """Test job failure raises UserException with error message"""
+        # Configure mock
+        mock_client_instance = mock_client.return_value
+        mock_client_instance.workspaces.load_tables.return_value = {"id": "12345"}
+        mock_client_instance.jobs.detail.return_value = {
+            "id": "12345",
+            "status": "error",
+            "error": {"message": "Table not found"},
+        }
+
+        # Run component - should raise exception
+        comp = Component()
+        with self.assertRaises(Exception) as context:
+            comp.run()
+
+        # Check error message contains the error from the job
+        self.assertIn("Table not found", str(context.exception))
+
+    # RUN REPORT TESTS
+
+    @freeze_time("2024-01-15 10:00:00")
+    @mock.patch("kbcstorage.client.Client")
+    @mock.patch.dict(
+        os.environ,
+        {
+            "KBC_DATADIR": "./tests/data/full_load_basic",
+            "KBC_STACKID": "connection.keboola.com",
+            "KBC_TOKEN": "test-token",
+            "KBC_CONFIGID": "12345",
+        },
+    )
+    def test_run_report(self, mock_client):
+        """Test run writes phase timings and job results to the run report"""
+        # Configure mock
+        mock_client_instance = mock_client.return_value
+        mock_client_instance.workspaces.load_tables.return_value = {"id": "12345"}
+        mock_client_instance.jobs.detail.return_value = {
+            "status": "success",
+            "id": "12345",
+            "createdTime": "2024-01-14T09:00:00+00:00",
+            "startTime": "2024-01-15T10:00:01+00:00",
+            "endTime": "2024-01-15T10:00:05+00:00",
+        }
+
+        comp = Component()
+        comp.run()
+
+        with open("./tests/data/full_load_basic/out/files/run_report.json") as f:
+            report = json.load(f)
+
+        self.assertEqual(report["status"], "success")
+        for phase in ["config_validation", "storage_input_parsing", "build_table_mapping", "workspace_resolution",
+                      "submit", "queue", "processing", "state_write"]:
+            self.assertIn(phase, report["phases"])
+        # queue time longer than a day is not truncated
+        self.assertEqual(report["phases"]["queue"], 90001.0)
+        self.assertEqual(report["phases"]["processing"], 4.0)
+        self.comparedict(report["jobs"][0], {"id": "12345", "status": "success", "polls": 1}, "Report job")
+        self.assertEqual(report["tables"], [{"destination": "users_table", "job_id": "12345", "success": True}])
+
+        # job metrics are kept across runs and exported for scrapers
+        self.assertEqual(
+            comp.state["job_history"],
+            {"users_table": {"queue_seconds": [90001.0], "processing_seconds": [4.0], "polls": [1]}},
+        )
+        with open("./tests/data/full_load_basic/out/files/job_metrics.prom") as f:
+            metrics = f.read()
+        self.assertIn('data_gateway_job_processing_seconds_bucket{table="users_table",le="5.0"} 1', metrics)
+        self.assertTrue(metrics.endswith("# EOF\n"))
+
+    # SYNC ACTION TESTS
+
+    @freeze_time("2024-01-15 10:00:00")
+    @mock.patch("component.time.sleep")  # Mock sleep to speed up test
+    @mock.patch("kbcstorage.client.Client")
+    @mock.patch.dict(
+        os.environ,
+        {
+            "KBC_DATADIR": "./tests/data/clean_workspace",
+            "KBC_STACKID": "connection.keboola.com",
+            "KBC_TOKEN": "test-token",
+            "KBC_CONFIGID": "12345",
+        },
+    )
+    def test_clean_workspace_action(self, mock_client, mock_sleep):
+        """Test clean_workspace sync action drops all tables"""
+        # Configure mock
+        mock_client_instance = mock_client.return_value
+        mock_client_instance.workspaces.load_tables.return_value = {"id": "12345"}
+        mock_client_instance.jobs.detail.return_value = {"status": "success", "id": "12345"}
+
+        # Run sync action directly
+        comp = Component()
+        result = comp.clean_workspace()
+
+        # Assert load_tables was called with empty table_mapping
+        call_args = mock_client_instance.workspaces.load_tables.call_args
+        self.comparedict(
+            call_args[1],
+            {"workspace_id": 12345, "table_mapping": [], "preserve": False, "load_type": "load"},
+            "clean_workspace parameters",
+        )
+
+        # Assert success result
+        self.assertEqual(result.message, "Workspace cleaned successfully")
+
+    @freeze_time("2024-01-15 10:00:00")
+    @mock.patch("kbcstorage.client.Client")
+    @mock.patch.dict(
+        os.environ,
+        {
+            "KBC_DATADIR": "./tests/data/incremental_adaptive",
+            "KBC_STACKID": "connection.keboola.com",
+            "KBC_TOKEN": "test-token",
+            "KBC_CONFIGID": "12345",
+        },
+    )
+    def test_incremental_load_after_clean_workspace(self, mock_client):
+        """Test an incremental table loads its whole history after the workspace was cleaned"""
+        # Configure mock
+        mock_client_instance = mock_client.return_value
+        mock_client_instance.configurations.base_url = "https://connection.keboola.com/v2/storage/components"
+        mock_client_instance.configurations.detail.return_value = {"rows": []}
+        mock_client_instance.configurations._get.return_value = {
+            "state": {
+                "component": {
+                    "last_run": "2024-01-15T09:00:00+00:00",
+                    "pending_jobs": {"abc": {"id": "1", "windows": {}}},
+                    "workspace": {"id": 12345},
+                }
+            }
+        }
+        mock_client_instance.workspaces.load_tables.return_value = {"id": "12345"}
+        mock_client_instance.jobs.detail.return_value = {
+            "status": "success",
+            "id": "12345",
+            "createdTime": "2024-01-15T10:00:00+00:00",
+            "startTime": "2024-01-15T10:00:01+00:00",
+            "endTime": "2024-01-15T10:00:05+00:00",
+        }
+
+        self.assertEqual(Component().clean_workspace().message, "Workspace cleaned successfully")
+        stored = json.loads(mock_client_instance.configurations._put.call_args[1]["json"]["state"])
+        self.assertEqual(stored["component"], {"workspace": {"id": 12345}})
+
+        comp = Component()
+        comp.state = stored["component"]
+        comp.run()
+        mapping = mock_client_instance.workspaces.load_tables.call_args[1]["table_mapping"][0]
+        self.comparedict(mapping, {"incremental": True, "changedSince": 1}, "After clean")
+
+    @freeze_time("2024-01-15 10:00:00")
+    @mock.patch("component.WorkspaceQuery")
+    @mock.patch("component.time.sleep")  # Mock sleep to speed up test
+    @mock.patch("kbcstorage.client.Client")
+    @mock.patch.dict(
+        os.environ,
+        {
+            "KBC_DATADIR": "./tests/data/clean_workspace",
+            "KBC_STACKID": "connection.keboola.com",
+            "KBC_TOKEN": "test-token",
+            "KBC_CONFIGID": "12345",
+            "KBC_BRANCHID": "678",
+        },
+    )
+    def test_clean_stale_tables_action(self, mock_client, mock_sleep, mock_query):
+        """Test stale tables are listed and the workspace is cleaned only when some exist"""
+        # Configure mock
+        mock_client_instance = mock_client.return_value
+        mock_client_instance.configurations.base_url = "https://connection.keboola.com/v2/storage/components"
+        mock_client_instance.configurations._get.return_value = {"state": {"component": {"workspace": {"id": 1}}}}
+        mock_client_instance.workspaces.load_tables.return_value = {"id": "12345"}
+        mock_client_instance.jobs.detail.return_value = {"status": "success", "id": "12345"}
+        row = {"tableId": "in.c-main.users", "dbName": "users", "items": []}
+        config = {
+            "configuration": {"parameters": {"db": {"workspaceId": 12345}}},
+            "rows": [
+                {
+                    "id": "1",
+                    "configuration": {"parameters": row},
+                    "state": {"component": {"tables": {"users": {}}, "workspace_tables": ["users", "users_preview"]}},
+                },
+                {"id": "2", "configuration": {"parameters": {**row, "dbName": "orders", "tableId": "in.c-main.o"}}},
+            ],
+        }
+        mock_client_instance.configurations.detail.return_value = config
+        mock_client_instance.workspaces.detail.return_value = {"connection": {"backend": "snowflake", "schema": "WS"}}
+        mock_query.return_value.execute.return_value = [["users"], ["deleted_row_table"]]
+
+        # the workspace contents are diffed, including tables of rows which no longer exist
+        comp = Component()
+        self.assertEqual(comp.list_stale_tables(), {"remove": ["deleted_row_table"], "keep": ["users"]})
+        mock_query.return_value.execute.assert_called_once_with(
+            "678", 12345, "SELECT TABLE_NAME FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = 'WS'"
+        )
+
+        # the tables recorded in the state are used when the workspace cannot be queried
+        mock_query.return_value.execute.side_effect = WorkspaceQueryError("Workspace query failed")
+        comp = Component()
+        self.assertEqual(comp.list_stale_tables(), {"remove": ["users_preview"], "keep": ["users"]})
+        mock_client_instance.workspaces.load_tables.assert_not_called()
+
+        # the whole workspace is reset only when confirmed
+        result = comp.clean_stale_tables()
+        self.assertEqual(result.type, MessageType.WARNING)
+        self.assertIn("confirm_workspace_reset", result.message)
+        mock_client_instance.workspaces.load_tables.assert_not_called()
+
+        comp.workspace_params.confirm_workspace_reset = True
+        result = comp.clean_stale_tables()
+        self.assertIn("users_preview", result.message)
+        mock_client_instance.workspaces.load_tables.assert_called_once()
+        # loaded tables are forgotten in the state of the configuration and every row
+        self.assertEqual(mock_client_instance.configurations._put.call_count, 3)
+        stored = json.loads(mock_client_instance.configurations._put.call_args[1]["json"]["state"])
+        self.assertEqual(stored["component"], {"workspace": {"id": 1}})
+
+        config["rows"][0]["state"] = {}
+        result = comp.clean_stale_tables()
+        self.assertEqual(result.message, "No stale tables in the workspace, nothing to clean.")
+        mock_client_instance.workspaces.load_tables.assert_called_once()
 
 
 if __name__ == "__main__":
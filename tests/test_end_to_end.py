@@ -0,0 +1,89 @@
+import json
+import os
+import tempfile
+import unittest
+
+import mock
+
+from component import Component
+from tests.benchmark_component import make_data_dir, measure
+from tests.fake_storage_api import FakeStorageApi, FakeStorageSettings
+
+
+class TestEndToEnd(unittest.TestCase):
+    """Runs the component over real HTTP against the fake Storage API."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_run_and_clean_workspace(self):
+        """Test run and clean_workspace succeed over one keep-alive connection despite transient errors"""
+        with FakeStorageApi(FakeStorageSettings(error_rate=0.5)) as api:
+            data_dir = make_data_dir(self.tmp.name, tables=3, columns=5)
+
+            run = measure(api, data_dir, "run")
+            self.assertEqual(run["api_calls_by_endpoint"]["load_tables"], 1)
+            self.assertEqual(run["api_calls_by_endpoint"]["job_detail"], 1)
+            self.assertGreater(api.calls["injected_errors"], 0)
+            self.assertEqual(run["connections"], 1)
+
+            api.settings.error_rate = 0
+            clean = measure(api, data_dir, "clean_workspace")
+            self.assertEqual(clean["api_calls_by_endpoint"]["load_tables"], 1)
+
+    def test_failed_job(self):
+        """Test a failing storage job is reported with the job error"""
+        with FakeStorageApi(FakeStorageSettings(failing_tables={"table_1"})) as api:
+            data_dir = make_data_dir(self.tmp.name, tables=2, columns=2)
+            env = {"KBC_DATADIR": data_dir, "KBC_URL": api.url, "KBC_TOKEN": "token", "KBC_BRANCHID": "default"}
+
+            with mock.patch.dict(os.environ, env):
+                with self.assertRaises(Exception) as context:
+                    Component().run()
+
+            self.assertIn("Injected job failure", str(context.exception))
+
+    def test_restarted_run_reattaches_to_job(self):
+        """Test a run restarted while polling adopts the job of the killed run instead of submitting a new one"""
+        with FakeStorageApi(FakeStorageSettings(processing_delay=0.3)) as api:
+            data_dir = make_data_dir(self.tmp.name, tables=2, columns=2, checkpoint_pending_jobs=True)
+            env = {
+                "KBC_DATADIR": data_dir,
+                "KBC_URL": api.url,
+                "KBC_TOKEN": "token",
+                "KBC_BRANCHID": "default",
+                "KBC_CONFIGID": "12345",
+            }
+
+            with mock.patch.dict(os.environ, env):
+                with mock.patch("job_waiter.JobWaiter.wait", side_effect=SystemExit):
+                    with self.assertRaises(SystemExit):
+                        Component().run()
+
+                # the platform hands the stored configuration state to the restarted container
+                pending = api.config_state["component"]["pending_jobs"]
+                self.assertEqual([job["id"] for job in pending.values()], ["1"])
+                with open(os.path.join(data_dir, "in", "state.json"), "w") as state_file:
+                    json.dump(api.config_state["component"], state_file)
+
+                comp = Component()
+                comp.run()
+
+            self.assertEqual(api.calls["load_tables"], 1)
+            self.assertNotIn("pending_jobs", comp.state)
+            self.assertEqual(set(comp.state["tables"]), {"table_0", "table_1"})
+
+    def test_single_job_not_checkpointed(self):
+        """Test a run with one storage job does not save its pending job to the configuration state"""
+        with FakeStorageApi() as api:
+            data_dir = make_data_dir(self.tmp.name, tables=2, columns=2)
+
+            run = measure(api, data_dir, "run")
+
+            self.assertEqual(run["api_calls_by_endpoint"]["load_tables"], 1)
+            self.assertNotIn("put_state", run["api_calls_by_endpoint"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+from job_metrics import HISTORY_SIZE, expected_duration, quantile, record_job, render_openmetrics
+
+
+class TestJobMetrics(unittest.TestCase):
+    def test_record_job_keeps_rolling_history(self):
+        """Test only known values are recorded and old samples roll out of the history"""
+        history = {}
+        for n in range(HISTORY_SIZE + 5):
+            record_job(history, "events", {"queue_seconds": n, "rows": None})
+
+        self.assertEqual(list(history["events"]), ["queue_seconds"])
+        self.assertEqual(history["events"]["queue_seconds"], list(range(5, HISTORY_SIZE + 5)))
+
+    def test_quantile_nearest_rank(self):
+        """Test quantiles pick the nearest ranked sample"""
+        values = [5, 1, 4, 2, 3]
+        self.assertEqual([quantile(values, q) for q in (0.5, 0.9, 0.99)], [3, 5, 5])
+        self.assertEqual(quantile([7], 0.5), 7)
+
+    def test_expected_duration(self):
+        """Test the prediction sums median queue and processing times and needs a few jobs"""
+        history = {"queue_seconds": [1, 2, 30], "processing_seconds": [10, 12, 11, 600]}
+        self.assertEqual(expected_duration(history), 13)
+        self.assertIsNone(expected_duration({"queue_seconds": [1, 2], "processing_seconds": [10, 12]}))
+        self.assertIsNone(expected_duration({}))
+
+    def test_render_openmetrics(self):
+        """Test histograms and summaries are rendered per table with escaped labels"""
+        history = {
+            'my"table': {"queue_seconds": [0.5, 10, 7200], "polls": [1, 3]},
+            "other": {"rows": [1000]},
+        }
+
+        lines = render_openmetrics(history).splitlines()
+
+        self.assertIn("# TYPE data_gateway_job_queue_seconds histogram", lines)
+        self.assertIn("# UNIT data_gateway_job_queue_seconds seconds", lines)
+        self.assertIn('data_gateway_job_queue_seconds_bucket{table="my\\"table",le="1.0"} 1', lines)
+        self.assertIn('data_gateway_job_queue_seconds_bucket{table="my\\"table",le="3600.0"} 2', lines)
+        self.assertIn('data_gateway_job_queue_seconds_bucket{table="my\\"table",le="+Inf"} 3', lines)
+        self.assertIn('data_gateway_job_queue_seconds_sum{table="my\\"table"} 7210.5', lines)
+        self.assertIn('data_gateway_job_queue_summary_seconds{table="my\\"table",quantile="0.5"} 10', lines)
+        self.assertIn('data_gateway_job_polls{table="my\\"table",quantile="0.9"} 3', lines)
+        self.assertIn('data_gateway_job_rows_count{table="other"} 1', lines)
+        self.assertFalse(any(line.startswith("data_gateway_job_processing_seconds") for line in lines))
+        self.assertEqual(lines[-1], "# EOF")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+import unittest
+import mock
+
+from job_journal import JobJournal
+from job_scheduler import LoadJobScheduler, split_batches
+from job_waiter import JobWaiter, JobWaitResult
+
+
+class TestLoadJobScheduler(unittest.TestCase):
+    def test_split_batches_smallest_first(self):
+        """Test tables are ordered by estimated size and split into batches"""
+        mapping = [{"destination": "big"}, {"destination": "small"}, {"destination": "medium"}]
+        sizes = {"big": 1000, "small": 1, "medium": 50}
+
+        batches = split_batches(mapping, sizes, tables_per_job=2)
+
+        self.assertEqual([[t["destination"] for t in batch] for batch in batches], [["small", "medium"], ["big"]])
+
+    def test_run_reports_results_per_batch(self):
+        """Test all batches are waited for and a failed job does not stop the others"""
+        client = mock.Mock()
+        client.workspaces.load_tables.side_effect = lambda table_mapping, **kwargs: {
+            "id": table_mapping[0]["destination"]
+        }
+        waiter = mock.Mock()
+        waiter.wait.side_effect = lambda job_id, **kwargs: JobWaitResult(
+            job={"id": job_id, "status": "error" if job_id == "b" else "success", "error": {"message": "boom"}},
+            polls=2,
+            waited_seconds=1.0,
+        )
+        scheduler = LoadJobScheduler(client, workspace_id=1, preserve=True, parallelism=2, waiter=waiter)
+
+        results = scheduler.run([[{"destination": "a"}], [{"destination": "b"}], [{"destination": "c"}]])
+
+        self.assertEqual([r.tables for r in results], [["a"], ["b"], ["c"]])
+        self.assertEqual([r.success for r in results], [True, False, True])
+        self.assertEqual(results[1].error, "Job b failed with error: boom")
+        self.assertEqual(client.workspaces.load_tables.call_count, 3)
+
+    def test_run_submit_error(self):
+        """Test a failing submission is reported as the batch error"""
+        client = mock.Mock()
+        client.workspaces.load_tables.side_effect = Exception("Workspace is locked")
+        scheduler = LoadJobScheduler(client, workspace_id=1, preserve=True, waiter=mock.Mock())
+
+        results = scheduler.run([[{"destination": "a"}]])
+
+        self.assertFalse(results[0].success)
+        self.assertEqual(results[0].error, "Workspace is locked")
+
+    @mock.patch("job_journal.time.time", return_value=1000)
+    def test_run_records_and_reattaches_jobs(self, mock_time):
+        """Test a submitted job is recorded in the state and a matching running job is adopted by the next run"""
+        client = mock.Mock()
+        client.workspaces.load_tables.return_value = {"id": "7"}
+        client.jobs.detail.return_value = {"id": "7", "status": "processing"}
+        waiter = mock.Mock()
+        waiter.wait.return_value = JobWaitResult(job={"id": "7", "status": "success"}, polls=1, waited_seconds=0.1)
+        state, save = {}, mock.Mock()
+
+        batch = [{"destination": "a", "changedSince": 10, "changedUntil": 20}]
+        LoadJobScheduler(client, 1, preserve=True, waiter=waiter, journal=JobJournal(state, save)).run([batch])
+        self.assertEqual(list(state["pending_jobs"].values()), [{"id": "7", "windows": {"a": 20}, "submitted_at": 1000}])
+        save.assert_called_once()
+
+        # the restarted run computes a later window end, but adopts the job and its window
+        batch = [{"destination": "a", "changedSince": 10, "changedUntil": 30}]
+        results = LoadJobScheduler(client, 1, preserve=True, waiter=waiter, journal=JobJournal(state, save)).run([batch])
+        self.assertTrue(results[0].success)
+        self.assertEqual(client.workspaces.load_tables.call_count, 1)
+        self.assertEqual(batch[0]["changedUntil"], 20)
+
+        # a failed pending job is submitted again
+        client.jobs.detail.return_value = {"id": "7", "status": "error"}
+        LoadJobScheduler(client, 1, preserve=True, waiter=waiter, journal=JobJournal(state, save)).run([batch])
+        self.assertEqual(client.workspaces.load_tables.call_count, 2)
+
+        # a job which succeeded long ago is outdated, so it is not adopted either
+        client.jobs.detail.return_value = {"id": "7", "status": "success"}
+        mock_time.return_value = 1000 + 3601
+        LoadJobScheduler(client, 1, preserve=True, waiter=waiter, journal=JobJournal(state, save)).run([batch])
+        self.assertEqual(client.workspaces.load_tables.call_count, 3)
+
+    def test_run_forgets_succeeded_jobs_when_a_batch_fails(self):
+        """Test jobs of succeeded batches are not left for adoption when a sibling batch fails the run"""
+        client = mock.Mock()
+        client.workspaces.load_tables.side_effect = lambda table_mapping, **kwargs: {
+            "id": table_mapping[0]["destination"]
+        }
+        waiter = mock.Mock()
+        waiter.wait.side_effect = lambda job_id, **kwargs: JobWaitResult(
+            job={"id": job_id, "status": "error" if job_id == "b" else "processing" if job_id == "c" else "success"},
+            polls=1,
+            waited_seconds=0.1,
+        )
+        state, save = {}, mock.Mock()
+
+        batches = [[{"destination": "a"}], [{"destination": "b"}], [{"destination": "c"}]]
+        LoadJobScheduler(client, 1, preserve=True, waiter=waiter, journal=JobJournal(state, save)).run(batches)
+
+        self.assertEqual([job["id"] for job in state["pending_jobs"].values()], ["c"])
+
+    @mock.patch("job_waiter.time.sleep")
+    @mock.patch("job_waiter.time.monotonic")
+    def test_run_cancels_job_past_deadline(self, mock_monotonic, mock_sleep):
+        """Test a job still running at the run deadline is cancelled and forgotten by the journal"""
+        mock_monotonic.side_effect = [100, 105, 121]
+        client = mock.Mock()
+        client.jobs.base_url = "https://connection.keboola.com/v2/storage/jobs"
+        client.workspaces.load_tables.return_value = {"id": "7"}
+        client.jobs.detail.return_value = {"id": "7", "status": "processing"}
+        state = {}
+
+        waiter = JobWaiter(client, initial_interval=30, jitter=0, deadline=120)
+        journal = JobJournal(state, mock.Mock())
+        scheduler = LoadJobScheduler(client, 1, preserve=True, waiter=waiter, journal=journal)
+        results = scheduler.run([[{"destination": "a"}]])
+
+        self.assertEqual(
+            results[0].error,
+            "Job 7 did not finish before the run deadline, last status: processing. The job was cancelled.",
+        )
+        mock_sleep.assert_called_once_with(15)
+        client.jobs._post.assert_called_once_with("https://connection.keboola.com/v2/storage/jobs/7/kill")
+        self.assertEqual(state["pending_jobs"], {})
+
+    @mock.patch("job_scheduler.time.monotonic")
+    def test_run_does_not_submit_past_deadline(self, mock_monotonic):
+        """Test batches reached after the run deadline fail without submitting a job"""
+        mock_monotonic.return_value = 120
+        client = mock.Mock()
+
+        scheduler = LoadJobScheduler(client, 1, preserve=True, waiter=JobWaiter(client), deadline=120)
+        results = scheduler.run([[{"destination": "a"}]])
+
+        self.assertEqual(results[0].error, "The run deadline passed before the job was submitted")
+        client.workspaces.load_tables.assert_not_called()
+
+    def test_run_passes_duration_budget(self):
+        """Test the waiter gets the largest expected duration of the tables in the batch"""
+        client = mock.Mock()
+        client.workspaces.load_tables.return_value = {"id": "7"}
+        waiter = mock.Mock()
+        waiter.wait.return_value = JobWaitResult(job={"id": "7", "status": "success"}, polls=1, waited_seconds=0.1)
+        budgets = {"a": 10, "b": 60}
+
+        LoadJobScheduler(client, 1, preserve=True, waiter=waiter, budgets=budgets).run(
+            [[{"destination": "a"}, {"destination": "b"}, {"destination": "c"}], [{"destination": "c"}]]
+        )
+
+        self.assertEqual([c[1]["budget"] for c in waiter.wait.call_args_list], [60, None])
+
+    def test_run_passes_expected_duration_to_new_jobs(self):
+        """Test newly submitted jobs get the longest expected duration of their tables and reattached ones none"""
+        client = mock.Mock()
+        client.workspaces.load_tables.return_value = {"id": "7"}
+        client.jobs.detail.return_value = {"id": "7", "status": "processing"}
+        waiter = mock.Mock()
+        waiter.wait.return_value = JobWaitResult(job={"id": "7", "status": "success"}, polls=1, waited_seconds=0.1)
+        state, expected = {}, {"a": 3.0, "b": 720.0}
+
+        batch = [{"destination": "a"}, {"destination": "b"}]
+        journal = JobJournal(state, mock.Mock())
+        LoadJobScheduler(client, 1, preserve=True, waiter=waiter, journal=journal, expected=expected).run([batch])
+        LoadJobScheduler(client, 1, preserve=True, waiter=waiter, journal=journal, expected=expected).run([batch])
+
+        self.assertEqual([c[1]["expected"] for c in waiter.wait.call_args_list], [720.0, None])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+import mock
+
+from job_waiter import JobWaiter, JobWaitTimeout
+
+
+class TestJobWaiter(unittest.TestCase):
+    def test_intervals_back_off_up_to_cap(self):
+        """Test poll intervals grow exponentially and never exceed the max interval"""
+        waiter = JobWaiter(mock.Mock(), initial_interval=1, max_interval=10, backoff_factor=2, jitter=0)
+        intervals = waiter.intervals()
+        self.assertEqual([next(intervals) for _ in range(6)], [1, 2, 4, 8, 10, 10])
+
+    def test_intervals_jitter(self):
+        """Test jitter keeps intervals within the configured band"""
+        waiter = JobWaiter(mock.Mock(), initial_interval=4, max_interval=100, backoff_factor=1, jitter=0.25)
+        intervals = waiter.intervals()
+        for _ in range(50):
+            self.assertTrue(3 <= next(intervals) <= 5)
+
+    @mock.patch("job_waiter.time.sleep")
+    def test_wait_reports_polls(self, mock_sleep):
+        """Test waiter polls until the job finishes and reports the poll count"""
+        client = mock.Mock()
+        client.jobs.detail.side_effect = [
+            {"id": "1", "status": "waiting"},
+            {"id": "1", "status": "processing"},
+            {"id": "1", "status": "success"},
+        ]
+
+        result = JobWaiter(client, jitter=0).wait("1")
+
+        self.assertEqual(result.job["status"], "success")
+        self.assertEqual(result.polls, 3)
+        self.assertEqual([c[0][0] for c in mock_sleep.call_args_list], [0.5, 0.75])
+
+    @mock.patch("job_waiter.time.sleep")
+    @mock.patch("job_waiter.time.monotonic")
+    def test_wait_timeout(self, mock_monotonic, mock_sleep):
+        """Test waiter gives up once the total timeout is exceeded"""
+        mock_monotonic.side_effect = [0, 5, 11]
+        client = mock.Mock()
+        client.jobs.detail.return_value = {"id": "1", "status": "processing"}
+
+        with self.assertRaises(JobWaitTimeout):
+            JobWaiter(client, initial_interval=8, jitter=0, timeout=10).wait("1")
+
+        self.assertEqual(client.jobs.detail.call_count, 2)
+        mock_sleep.assert_called_once_with(5)
+
+    @mock.patch("job_waiter.time.sleep")
+    @mock.patch("job_waiter.time.monotonic")
+    def test_wait_warns_over_budget(self, mock_monotonic, mock_sleep):
+        """Test waiter warns once when the job runs longer than its expected duration"""
+        mock_monotonic.side_effect = [0, 5, 15, 25]
+        client = mock.Mock()
+        client.jobs.detail.side_effect = [
+            {"id": "1", "status": "processing"},
+            {"id": "1", "status": "processing"},
+            {"id": "1", "status": "success"},
+        ]
+
+        with self.assertLogs(level="WARNING") as logs:
+            JobWaiter(client, jitter=0).wait("1", budget=10)
+
+        self.assertEqual(logs.output, ["WARNING:root:Job 1 has been running for 15 s, longer than expected 10 s."])
+
+    @mock.patch("job_waiter.time.sleep")
+    def test_wait_polls_near_expected_finish(self, mock_sleep):
+        """Test the first poll waits for most of the expected duration and polling then starts proportionally"""
+        client = mock.Mock()
+        client.jobs.detail.side_effect = [{"id": "1", "status": "processing"}, {"id": "1", "status": "success"}]
+
+        result = JobWaiter(client, jitter=0).wait("1", expected=100)
+
+        self.assertEqual(result.polls, 2)
+        self.assertEqual([c[0][0] for c in mock_sleep.call_args_list], [80, 2])
+
+    @mock.patch("job_waiter.time.sleep")
+    @mock.patch("job_waiter.time.monotonic")
+    def test_wait_expected_within_deadline(self, mock_monotonic, mock_sleep):
+        """Test the first poll is never scheduled after the run deadline"""
+        mock_monotonic.side_effect = [100, 130]
+        client = mock.Mock()
+        client.jobs.detail.return_value = {"id": "1", "status": "success"}
+
+        JobWaiter(client, jitter=0, deadline=130).wait("1", expected=600)
+
+        mock_sleep.assert_called_once_with(30)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+from datetime import datetime, timezone
+
+from configuration import TableSpec
+from load_planner import plan_delta_load, plan_load
+
+
+def make_spec(items=None, primary_key=None):
+    return TableSpec(tableId="in.c-main.events", dbName="events", items=items or [], primaryKey=primary_key or [])
+
+
+TYPED_ITEMS = [
+    {"name": "id", "dbName": "id", "type": "INTEGER", "nullable": False},
+    {"name": "amount", "dbName": "amount", "type": "NUMBER", "nullable": True, "size": "10,2"},
+]
+BIG_TABLE = {"rowsCount": 50_000_000, "dataSizeBytes": 8_000_000_000, "columns": ["id", "amount"]}
+
+
+class TestLoadPlanner(unittest.TestCase):
+    def test_clone_without_column_changes(self):
+        """Test tables without typed columns are cloned"""
+        self.assertEqual(plan_load(make_spec(), BIG_TABLE, has_history=False).load_type, "CLONE")
+
+        identity = [{"name": c, "dbName": c, "type": "VARCHAR", "nullable": False} for c in ["id", "amount"]]
+        self.assertEqual(plan_load(make_spec(identity), BIG_TABLE, has_history=False).load_type, "CLONE")
+
+    def test_copy_for_nullable_or_default(self):
+        """Test columns converting empty values to NULL or filling a default need COPY"""
+        nullable = [{"name": c, "dbName": c, "type": "VARCHAR", "nullable": True} for c in ["id", "amount"]]
+        self.assertEqual(plan_load(make_spec(nullable), BIG_TABLE, has_history=False).load_type, "COPY")
+
+        defaulted = [{"name": c, "dbName": c, "type": "VARCHAR", "nullable": False} for c in ["id", "amount"]]
+        defaulted[1]["default"] = "0"
+        self.assertEqual(plan_load(make_spec(defaulted), BIG_TABLE, has_history=False).load_type, "COPY")
+
+    def test_copy_for_subset_or_filter(self):
+        """Test column subsets and row filters need COPY"""
+        subset = [{"name": "id", "dbName": "id", "type": "VARCHAR", "nullable": False}]
+        self.assertEqual(plan_load(make_spec(subset), BIG_TABLE, has_history=False).load_type, "COPY")
+        self.assertEqual(plan_load(make_spec(), BIG_TABLE, has_history=False, filtered=True).load_type, "COPY")
+
+    def test_incremental_for_large_table_with_history(self):
+        """Test incremental COPY is chosen only for large tables with a primary key and a previous load"""
+        spec = make_spec(TYPED_ITEMS, ["id"])
+
+        plan = plan_load(spec, BIG_TABLE, has_history=True)
+        self.assertEqual((plan.load_type, plan.incremental), ("COPY", True))
+
+        self.assertFalse(plan_load(spec, BIG_TABLE, has_history=False).incremental)
+        self.assertFalse(plan_load(spec, {**BIG_TABLE, "rowsCount": 10}, has_history=True).incremental)
+        self.assertFalse(plan_load(make_spec(TYPED_ITEMS), BIG_TABLE, has_history=True).incremental)
+
+    def test_delta_load(self):
+        """Test full loads become upserts only for small growth within the full reload interval"""
+        spec = make_spec(TYPED_ITEMS, ["id"])
+        now = datetime(2024, 1, 15, tzinfo=timezone.utc)
+        loaded = {"rows_count": 1000, "full_load_at": "2024-01-14T00:00:00+00:00"}
+
+        def plan(rows, loaded=loaded, spec=spec, has_history=True):
+            return plan_delta_load(spec, {"rowsCount": rows}, loaded, has_history, 0.1, 7, now)
+
+        self.assertTrue(plan(1050).incremental)
+        self.assertFalse(plan(2000).incremental)
+        self.assertIn("deleted", plan(900).reason)
+        self.assertFalse(plan(1050, loaded={**loaded, "full_load_at": "2024-01-01T00:00:00+00:00"}).incremental)
+        self.assertFalse(plan(1050, loaded={}).incremental)
+        self.assertFalse(plan(1050, has_history=False).incremental)
+        self.assertFalse(plan(1050, spec=make_spec(TYPED_ITEMS)).incremental)
+
+    def test_delta_load_metadata(self):
+        """Test deletes and recreations visible in the table metadata force a full load"""
+        spec = make_spec(TYPED_ITEMS, ["id"])
+        now = datetime(2024, 1, 15, tzinfo=timezone.utc)
+        loaded = {
+            "rows_count": 1000,
+            "full_load_at": "2024-01-14T00:00:00+00:00",
+            "watermark": "2024-01-14T12:00:00+00:00",
+        }
+
+        def plan(**detail):
+            return plan_delta_load(spec, {"rowsCount": 1000, **detail}, loaded, True, 0.1, 7, now)
+
+        imported, created = "2024-01-14T18:00:00+0100", "2023-01-01T00:00:00+0100"
+        self.assertTrue(plan(lastImportDate=imported, lastChangeDate=imported, created=created).incremental)
+        # rows deleted after the last import and after the previous load
+        deleted = plan(lastImportDate=imported, lastChangeDate="2024-01-14T20:00:00+0100")
+        self.assertIn("outside of imports", deleted.reason)
+        # changes before the previous load were loaded by it
+        earlier = plan(lastImportDate="2024-01-13T00:00:00+0100", lastChangeDate="2024-01-14T09:00:00+0100")
+        self.assertTrue(earlier.incremental)
+        self.assertIn("recreated", plan(created="2024-01-14T06:00:00+0100").reason)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import mock
+from kbcstorage.client import Client
+
+from storage_transport import StorageTransport
+
+
+class FlakyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    responses = []
+
+    def do_GET(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        status, headers = self.responses.pop(0) if self.responses else (200, {})
+        body = b'{"id": "1", "status": "success"}' if status == 200 else b"{}"
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_POST = do_GET
+
+    def log_message(self, *args):
+        pass
+
+
+class TestStorageTransport(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), FlakyHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_keep_alive_and_retries(self):
+        """Test endpoints share one pooled connection and transient errors are retried"""
+        FlakyHandler.responses = [(503, {}), (429, {"Retry-After": "0"})]
+        client = Client(self.url, "token", file_storage_support=False)
+        transport = StorageTransport(backoff_factor=0)
+        transport.attach(client)
+
+        for _ in range(3):
+            self.assertEqual(client.jobs.detail("1")["status"], "success")
+        client.tables.detail("in.c-main.users")
+
+        stats = transport.get_stats()
+        self.assertEqual(stats.requests, 4)
+        self.assertEqual(stats.retries, 2)
+        self.assertEqual(stats.connections, 1)
+
+    def test_post_retried_only_when_rate_limited(self):
+        """Test non-idempotent calls are not repeated after a server error"""
+        client = Client(self.url, "token", file_storage_support=False)
+        transport = StorageTransport(backoff_factor=0)
+        transport.attach(client)
+
+        FlakyHandler.responses = [(429, {"Retry-After": "0"})]
+        client.workspaces.load_tables(1, [])
+        self.assertEqual(transport.get_stats().retries, 1)
+
+        FlakyHandler.responses = [(503, {})]
+        with self.assertRaises(Exception):
+            client.workspaces.load_tables(1, [])
+        self.assertEqual(transport.get_stats().retries, 1)
+
+    def test_server_time_from_date_header(self):
+        """Test Storage API clock is estimated from response Date headers"""
+        client = Client(self.url, "token", file_storage_support=False)
+        transport = StorageTransport()
+        transport.attach(client)
+        self.assertIsNone(transport.server_time())
+
+        client.jobs.detail("1")
+
+        server_time = transport.server_time()
+        self.assertLessEqual(server_time, time.time())
+        self.assertGreater(server_time, time.time() - 3)
+
+    def test_attach_ignores_non_endpoints(self):
+        """Test attaching to a mocked client does not fail"""
+        StorageTransport().attach(mock.MagicMock())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import mock
+
+from workspace_query import WorkspaceQuery, WorkspaceQueryError, list_tables_statement
+
+
+def response(payload):
+    return mock.Mock(json=mock.Mock(return_value=payload))
+
+
+class TestWorkspaceQuery(unittest.TestCase):
+    @mock.patch("workspace_query.time.sleep")
+    def test_execute_returns_rows(self, mock_sleep):
+        """Test the query is submitted to Query Service of the stack and its rows returned once it completes"""
+        transport = mock.Mock()
+        transport.request.side_effect = [
+            response({"queryJobId": "q1"}),
+            response({"queryJobId": "q1", "status": "processing", "statements": [{"id": "s1"}]}),
+            response({"queryJobId": "q1", "status": "completed", "statements": [{"id": "s1"}]}),
+            response({"columns": [{"name": "TABLE_NAME"}], "data": [["users"], ["orders"]]}),
+        ]
+
+        query = WorkspaceQuery(transport, "https://connection.keboola.com/", "token")
+        rows = query.execute("678", 12345, "SELECT 1")
+
+        self.assertEqual(rows, [["users"], ["orders"]])
+        urls = [c[0][:2] for c in transport.request.call_args_list]
+        self.assertEqual(
+            urls,
+            [
+                ("POST", "https://query.keboola.com/api/v1/branches/678/workspaces/12345/queries"),
+                ("GET", "https://query.keboola.com/api/v1/queries/q1"),
+                ("GET", "https://query.keboola.com/api/v1/queries/q1"),
+                ("GET", "https://query.keboola.com/api/v1/queries/q1/s1/results"),
+            ],
+        )
+        self.assertEqual(transport.request.call_args[1]["headers"], {"X-StorageAPI-Token": "token"})
+        mock_sleep.assert_called_once_with(0.2)
+
+    @mock.patch("workspace_query.time.sleep")
+    def test_execute_failed(self, mock_sleep):
+        """Test a failed statement raises with its error"""
+        transport = mock.Mock()
+        transport.request.side_effect = [
+            response({"queryJobId": "q1"}),
+            response({"queryJobId": "q1", "status": "failed", "statements": [{"id": "s1", "error": "denied"}]}),
+        ]
+
+        with self.assertRaisesRegex(WorkspaceQueryError, "failed: denied"):
+            WorkspaceQuery(transport, "https://connection.keboola.com", "token").execute("678", 1, "SELECT 1")
+
+    def test_list_tables_statement(self):
+        """Test the table listing reads the information schema of the workspace backend"""
+        self.assertEqual(
+            list_tables_statement({"backend": "snowflake", "schema": "WORKSPACE_1"}),
+            "SELECT TABLE_NAME FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_SCHEMA = 'WORKSPACE_1'",
+        )
+        self.assertEqual(
+            list_tables_statement({"backend": "bigquery", "schema": "WORKSPACE_1"}),
+            "SELECT table_name FROM `WORKSPACE_1`.INFORMATION_SCHEMA.TABLES",
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()